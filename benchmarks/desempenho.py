@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+import warnings
+from datetime import datetime
+
+# Benchmark dos métodos: varre métodos x n_pontos (Poisson, Helmholtz) e
+# métodos x n_passos (Calor, Onda) sobre os exemplos de preencher_exemplo,
+# registrando o tempo de cada fase e o pico de memória.
+#
+#   python benchmarks/desempenho.py executar -o base.json
+#   python benchmarks/desempenho.py executar -o novo.json
+#   python benchmarks/desempenho.py comparar base.json novo.json --limiar 0.2
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+from methods import METODOS  # noqa: E402
+from methods.edp_solver_base import limpar_cache  # noqa: E402
+from methods.perfil import PerfilExecucao  # noqa: E402
+from time_solvers.calor_1d import solve_calor_1d  # noqa: E402
+from time_solvers.onda_1d import solve_onda_1d  # noqa: E402
+
+# Mesmos valores de EDPSolverApp.preencher_exemplo
+EXEMPLOS = {
+    'Poisson': {'p': '1', 'q': '0', 'r': '0', 'f': 'sin(pi*x)', 'a': 0, 'b': 1, 'ua': 0, 'ub': 0},
+    'Helmholtz': {'p': '1', 'q': '0', 'r': '10', 'f': 'sin(pi*x)', 'a': 0, 'b': 1, 'ua': 0, 'ub': 0},
+    'Calor': {'f': '0', 'u0': '3*sin(2*pi*x/1)', 'a': 0, 'b': 1, 'ua': 0, 'ub': 0,
+              'n_pontos': 20, 'dt': 0.01},
+    'Onda': {'f': '0', 'u0': 'sin(pi*x)', 'v0': '0', 'a': 0, 'b': 1, 'ua': 0, 'ub': 4,
+             'n_pontos': 20, 'dt': 0.01},
+}
+N_PONTOS = [10, 20, 40]
+N_PASSOS = [10, 50, 100]
+# Fases abaixo deste tempo (s) não são comparadas (ruído de medição)
+TEMPO_MINIMO = 1e-3
+
+
+def _fases(perfil):
+    # Tempo por fase do PerfilExecucao (ver methods/perfil.py) mais o restante
+    fases = {nome: duracao for nome, duracao in perfil.fases.items() if perfil.chamadas[nome]}
+    fases['outros'] = perfil.outros
+    return fases
+
+
+def rodar_estacionario(tipo, metodo, n_pontos):
+    exemplo = EXEMPLOS[tipo]
+    edp_params = {k: sp.sympify(exemplo[k]) for k in ('p', 'q', 'r', 'f')}
+    with PerfilExecucao(f"{tipo}/{metodo}", notificar=False) as perfil:
+        solver = METODOS[metodo]((exemplo['a'], exemplo['b']), n_pontos,
+                                 {'tipo': 'dirichlet', 'valores': (exemplo['ua'], exemplo['ub'])})
+        solver.resolver(edp_params)
+    return _fases(perfil)
+
+
+def rodar_temporal(tipo, metodo, n_passos):
+    exemplo = EXEMPLOS[tipo]
+    argumentos = [exemplo['f'], exemplo['u0']]
+    if tipo == 'Onda':
+        argumentos.append(exemplo['v0'])
+    argumentos += [exemplo['a'], exemplo['b'], exemplo['ua'], exemplo['ub'],
+                   exemplo['n_pontos'], exemplo['dt'], n_passos]
+    solver = solve_onda_1d if tipo == 'Onda' else solve_calor_1d
+    with PerfilExecucao(f"{tipo}/{metodo}", notificar=False) as perfil:
+        solver(*argumentos, metodo)
+    fases = _fases(perfil)
+    fases['por_passo'] = perfil.media_passo
+    return fases
+
+
+def medir(funcao, *args, repeticoes=3):
+    # Melhor tempo por fase entre as repetições (cache frio em cada uma) e pico
+    # de memória numa execução separada com tracemalloc (que distorce os tempos)
+    melhores = None
+    for _ in range(repeticoes):
+        limpar_cache()
+        tempos = funcao(*args)
+        if melhores is None:
+            melhores = tempos
+        else:
+            melhores = {fase: min(melhores[fase], tempos[fase]) for fase in melhores}
+    limpar_cache()
+    tracemalloc.start()
+    funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(duracao for fase, duracao in melhores.items() if fase != 'por_passo')
+    return {'fases': melhores, 'total': total, 'pico_memoria_kb': pico / 1024}
+
+
+def executar(args):
+    # Aquecimento: imports tardios (scipy, quadratura) não entram na primeira medição
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for metodo in args.metodos:
+            rodar_estacionario('Poisson', metodo, min(args.n_pontos))
+    casos = {}
+    for tipo in args.tipos:
+        estacionario = tipo in ('Poisson', 'Helmholtz')
+        tamanhos = args.n_pontos if estacionario else args.n_passos
+        for metodo in args.metodos:
+            for tamanho in tamanhos:
+                chave = f"{tipo}/{metodo}/{'n_pontos' if estacionario else 'n_passos'}={tamanho}"
+                rodar = rodar_estacionario if estacionario else rodar_temporal
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter('ignore')
+                        casos[chave] = medir(rodar, tipo, metodo, tamanho, repeticoes=args.repeticoes)
+                except Exception as e:
+                    casos[chave] = {'erro': f"{type(e).__name__}: {e}"}
+                    print(f"{chave:50s} erro: {casos[chave]['erro']}")
+                    continue
+                print(f"{chave:50s} {casos[chave]['total'] * 1e3:10.2f} ms "
+                      f"{casos[chave]['pico_memoria_kb']:10.1f} KiB")
+    resultado = {
+        'meta': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sympy': sp.__version__,
+            'plataforma': platform.platform(),
+            'repeticoes': args.repeticoes,
+        },
+        'casos': casos
+    }
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {args.saida}")
+    return 0
+
+
+def comparar(args):
+    # Regressão: tempo total ou de alguma fase (acima de TEMPO_MINIMO) maior que
+    # (1 + limiar) vezes a linha de base; pico de memória idem
+    with open(args.base, encoding='utf-8') as arquivo:
+        base = json.load(arquivo)['casos']
+    with open(args.novo, encoding='utf-8') as arquivo:
+        novo = json.load(arquivo)['casos']
+    regressoes = 0
+    for chave in sorted(set(base) & set(novo)):
+        antes, depois = base[chave], novo[chave]
+        if 'erro' in antes or 'erro' in depois:
+            if 'erro' in depois and 'erro' not in antes:
+                print(f"{chave}: passou a falhar ({depois['erro']})")
+                regressoes += 1
+            continue
+        medidas = [('total', antes['total'], depois['total'])]
+        medidas += [(fase, antes['fases'][fase], depois['fases'][fase])
+                    for fase in antes['fases'] if fase in depois['fases']]
+        medidas.append(('pico_memoria_kb', antes['pico_memoria_kb'], depois['pico_memoria_kb']))
+        for nome, valor_antes, valor_depois in medidas:
+            if nome != 'pico_memoria_kb' and max(valor_antes, valor_depois) < TEMPO_MINIMO:
+                continue
+            razao = valor_depois / valor_antes if valor_antes > 0 else float('inf')
+            if razao > 1 + args.limiar:
+                print(f"{chave} [{nome}]: {valor_antes:.4g} -> {valor_depois:.4g} ({razao:.2f}x)")
+                regressoes += 1
+    ausentes = set(base) - set(novo)
+    if ausentes:
+        print(f"{len(ausentes)} caso(s) da linha de base ausente(s) na nova execução")
+    print(f"{regressoes} regressão(ões) acima de {args.limiar:.0%}")
+    return 1 if regressoes else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos métodos numéricos por fase.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_exec = comandos.add_parser('executar', help="roda a varredura e grava um JSON")
+    p_exec.add_argument('-o', '--saida', default='benchmark.json')
+    p_exec.add_argument('--tipos', nargs='+', default=list(EXEMPLOS), choices=list(EXEMPLOS))
+    p_exec.add_argument('--metodos', nargs='+', default=list(METODOS), choices=list(METODOS))
+    p_exec.add_argument('--n-pontos', nargs='+', type=int, default=N_PONTOS)
+    p_exec.add_argument('--n-passos', nargs='+', type=int, default=N_PASSOS)
+    p_exec.add_argument('-r', '--repeticoes', type=int, default=3)
+    p_exec.set_defaults(funcao=executar)
+
+    p_comp = comandos.add_parser('comparar', help="compara duas execuções e aponta regressões")
+    p_comp.add_argument('base')
+    p_comp.add_argument('novo')
+    p_comp.add_argument('--limiar', type=float, default=0.2,
+                        help="aumento relativo tolerado (padrão: 0.2 = 20%%)")
+    p_comp.set_defaults(funcao=comparar)
+
+    args = parser.parse_args(argv)
+    return args.funcao(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Benchmark de inicialização: mede o tempo de import de cada ponto de entrada com
+# `python -X importtime` (em processos novos) e compara com o orçamento em JSON.
+# Também falha se algum módulo pesado proibido for carregado no import.
+#
+#   python benchmarks/inicializacao.py              # compara com o orçamento
+#   python benchmarks/inicializacao.py --atualizar  # regrava o orçamento (medição x folga)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(RAIZ, 'src')
+ORCAMENTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'orcamento_inicializacao.json')
+# Limite mínimo ao regravar: imports muito rápidos oscilam demais entre execuções
+LIMITE_MINIMO_MS = 50.0
+
+
+def medir_import(modulo):
+    # (tempo cumulativo em ms do módulo, conjunto de pacotes de topo importados)
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=SRC, capture_output=True, text=True, check=True).stderr
+    tempo = None
+    pacotes = set()
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, cumulativo, nome = linha[len('import time:'):].split('|')
+        nome = nome.strip()
+        pacotes.add(nome.split('.')[0])
+        if nome == modulo:
+            tempo = int(cumulativo) / 1000
+    return tempo, pacotes
+
+
+def medir(modulo, repeticoes):
+    tempos = []
+    pacotes = set()
+    for _ in range(repeticoes):
+        tempo, importados = medir_import(modulo)
+        tempos.append(tempo)
+        pacotes |= importados
+    return statistics.median(tempos), pacotes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização (import).")
+    parser.add_argument('--orcamento', default=ORCAMENTO, help="arquivo JSON com o orçamento")
+    parser.add_argument('-n', '--repeticoes', type=int, default=5,
+                        help="processos por módulo; usa a mediana (padrão: 5)")
+    parser.add_argument('--atualizar', action='store_true',
+                        help="regrava os limites como medição x folga")
+    args = parser.parse_args(argv)
+
+    with open(args.orcamento, encoding='utf-8') as arquivo:
+        orcamento = json.load(arquivo)
+    folga = orcamento.get('folga', 2.0)
+
+    violacoes = []
+    for modulo, regra in orcamento['modulos'].items():
+        tempo, pacotes = medir(modulo, args.repeticoes)
+        proibidos = sorted(pacotes & set(regra.get('proibidos', [])))
+        situacao = 'ok'
+        if proibidos:
+            situacao = f"importa {', '.join(proibidos)}"
+            violacoes.append(modulo)
+        elif not args.atualizar and tempo > regra['limite_ms']:
+            situacao = f"acima do orçamento ({regra['limite_ms']:.0f} ms)"
+            violacoes.append(modulo)
+        print(f"{modulo:12s} {tempo:8.1f} ms  {situacao}")
+        if args.atualizar:
+            regra['limite_ms'] = round(max(tempo * folga, LIMITE_MINIMO_MS), 1)
+
+    if args.atualizar:
+        with open(args.orcamento, 'w', encoding='utf-8') as arquivo:
+            json.dump(orcamento, arquivo, indent=2, ensure_ascii=False)
+            arquivo.write('\n')
+    return 1 if violacoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,28 +1,43 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import sympy as sp
+import queue
+import threading
 from datetime import datetime
-from methods.rayleigh_ritz import RayleighRitz
-from methods.galerkin import Galerkin
-from methods.colocacao import MetodoColocacao
-from methods.momentos import MetodoMomentos
-from methods.subdominios import MetodoSubdominios
-from methods.minimos_quadrados import MetodoMinimosQuadrados
+from methods import METODOS
+from execucao import resolver_todos, resolver_nova_carga, n_processos_padrao, somar_uso_cache
+
+# sympy, matplotlib e os solvers são importados só quando necessários
+# (validação/resolução e gráficos), para a janela abrir rapidamente.
+
+# Intervalo (ms) de atualização da barra de progresso
+INTERVALO_PROGRESSO = 50
+
+
+def criar_figura(**kwargs):
+    # Figura do matplotlib sem pyplot (import adiado até o primeiro gráfico)
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
 
 # Classe principal da aplicação
 
 
 class EDPSolverApp:
-    def __init__(self, root):
+    def __init__(self, root, n_processos=None):
         # Inicializa a janela principal
         self.root = root
         self.root.title("EDP Solver")
         self.root.geometry("1200x800")
 
         self.resultados = {}  # Armazena os resultados dos métodos
+        self.erros = {}       # Mensagens de erro dos métodos que falharam
+        # Nº de processos para resolver os métodos em paralelo (1 = sequencial)
+        self.n_processos = n_processos if n_processos is not None else n_processos_padrao()
+        self.execucao = None  # estado da resolução em andamento (thread de fundo)
+        # Solvers da última resolução estacionária (operadores já fatorados) e os
+        # parâmetros que definem esses operadores: se só f mudar, são reaproveitados
+        self.solvers = {}
+        self.assinatura_operador = None
         self.figura = None    # Figura do matplotlib para gráficos
         self.canvas = None    # Canvas do matplotlib na interface
 
@@ -193,13 +208,11 @@ class EDPSolverApp:
         # Bind para atualizar campos ao trocar o tipo de equação
         self.edp_var.bind("<<ComboboxSelected>>", self.on_edp_change)
 
-        # Exibição simbólica da equação
-        self.equation_fig = plt.Figure(figsize=(8, 1.2), dpi=100)
-        self.equation_ax = self.equation_fig.add_subplot(111)
-        self.equation_ax.axis('off')
-        self.equation_canvas = FigureCanvasTkAgg(self.equation_fig, master=config_frame)
-        self.equation_canvas.get_tk_widget().grid(row=0, column=3, rowspan=3, padx=20, pady=5, sticky='n')
-        self.update_equation_display()
+        # Exibição simbólica da equação: o matplotlib é carregado depois que a janela aparece
+        self.equation_frame = ttk.Frame(config_frame)
+        self.equation_frame.grid(row=0, column=3, rowspan=3, padx=20, pady=5, sticky='n')
+        self.equation_canvas = None
+        self.root.after_idle(self.update_equation_display)
 
         # Botão para resolver a EDP
         ttk.Button(config_frame, text="Resolver", command=self.solve_edp, style="Big.TButton").grid(
@@ -230,6 +243,11 @@ class EDPSolverApp:
         self.report_text.pack(fill='both', expand=True, padx=10, pady=10)
         ttk.Button(self.frame_relatorio, text="Exportar PDF",
                    command=self.export_report_pdf, style="Big.TButton").pack(pady=10)
+        # Tempos por fase (simbólico, compilação, montagem, solução, avaliação)
+        self.mostrar_perfil = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.frame_relatorio, text="Exibir tempos por fase",
+                        variable=self.mostrar_perfil,
+                        command=lambda: self.resultados and self.display_report()).pack()
 
     def create_help_frame(self):
         # Aba de ajuda com instruções e dicas
@@ -345,6 +363,7 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
                 'Erro de entrada', 'As condições de contorno devem ser números reais.')
             return False
         # Validação de expressões sympy
+        import sympy as sp
         try:
             sp.sympify(self.entry_p.get())
             sp.sympify(self.entry_q.get())
@@ -357,6 +376,8 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
         return True
 
     def solve_edp(self):
+        import sympy as sp
+
         # Função utilitária para converter expressões para float de forma robusta
         def safe_float(expr, default):
             try:
@@ -370,17 +391,8 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
         # Executa a resolução da EDP usando todos os métodos numéricos
         if not self.validate_inputs():
             return
-        # Adiciona indicador de processamento
-        progress = tk.Toplevel(self.root)
-        progress.title('Processando...')
-        progress.geometry('350x80')
-        label = tk.Label(
-            progress, text='Resolvendo EDP, aguarde...', font=("Arial", 16))
-        label.pack(pady=10)
-        pb = ttk.Progressbar(progress, mode='indeterminate', length=300)
-        pb.pack(pady=5)
-        pb.start(10)
-        self.root.update_idletasks()
+        if self.execucao is not None:
+            return  # já existe uma resolução em andamento
         try:
             tipo = self.edp_var.get()
             a = float(self.entry_a.get())
@@ -389,13 +401,12 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
             ub = float(self.entry_ub.get())
             n_pontos = int(self.entry_n_pontos.get())
             self.resultados = {}
+            self.erros = {}
+            parametros = {'a': a, 'b': b, 'ua': ua, 'ub': ub, 'n_pontos': n_pontos}
             if tipo == "Onda":
-                from time_solvers import onda_1d
                 f_expr = self.entry_f.get()
                 if not isinstance(f_expr, str):
                     messagebox.showerror("Erro", "O termo fonte f(x) deve ser uma expressão simbólica (ex: 0, sin(pi*x)). Não use arrays NumPy.")
-                    pb.stop()
-                    progress.destroy()
                     return
                 u0_expr = self.entry_u0.get()
                 v0_expr = self.entry_v0.get()
@@ -403,13 +414,9 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
                 tmax = safe_float(self.entry_tmax.get() if hasattr(self, 'entry_tmax') else '', 1.0)
                 if dt <= 0:
                     messagebox.showerror("Erro", "O valor de Δt deve ser um número real positivo.")
-                    pb.stop()
-                    progress.destroy()
                     return
                 if tmax <= 0:
                     messagebox.showerror("Erro", "O valor de T_max deve ser um número real positivo.")
-                    pb.stop()
-                    progress.destroy()
                     return
                 try:
                     n_passos = int(tmax / dt)
@@ -417,33 +424,18 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
                         n_passos = 1
                 except Exception:
                     n_passos = 100
-                for metodo in [
-                    'Rayleigh-Ritz', 'Galerkin', 'Colocação', 'Momentos', 'Subdomínios', 'Mínimos Quadrados']:
-                    x_vals, resultados = onda_1d.solve_onda_1d(
-                        f_expr, u0_expr, v0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo=metodo)
-                    sol_final = resultados[-1]
-                    info = f"máx: {np.max(sol_final):.4g}, mín: {np.min(sol_final):.4g}"
-                    self.resultados[metodo] = {
-                        'solution': sol_final,
-                        'coefficients': info
-                    }
-                self.display_results()
-                self.display_report()
+                parametros.update({'f': f_expr, 'u0': u0_expr, 'v0': v0_expr,
+                                   'dt': dt, 'n_passos': n_passos})
             elif tipo == "Calor":
-                from time_solvers import calor_1d
                 f_expr = self.entry_f.get()
                 u0_expr = self.entry_u0.get()
                 dt = safe_float(self.entry_dt.get() if hasattr(self, 'entry_dt') else '', 0.01)
                 tmax = safe_float(self.entry_tmax.get() if hasattr(self, 'entry_tmax') else '', 1.0)
                 if dt <= 0:
                     messagebox.showerror("Erro", "O valor de Δt deve ser um número real positivo.")
-                    pb.stop()
-                    progress.destroy()
                     return
                 if tmax <= 0:
                     messagebox.showerror("Erro", "O valor de T_max deve ser um número real positivo.")
-                    pb.stop()
-                    progress.destroy()
                     return
                 try:
                     n_passos = int(tmax / dt)
@@ -451,46 +443,122 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
                         n_passos = 1
                 except Exception:
                     n_passos = 100
-                for metodo in [
-                    'Rayleigh-Ritz', 'Galerkin', 'Colocação', 'Momentos', 'Subdomínios', 'Mínimos Quadrados']:
-                    x_vals, resultados = calor_1d.solve_calor_1d(
-                        f_expr, u0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo=metodo)
-                    sol_final = resultados[-1]
-                    info = f"máx: {np.max(sol_final):.4g}, mín: {np.min(sol_final):.4g}"
-                    self.resultados[metodo] = {
-                        'solution': sol_final,
-                        'coefficients': info
-                    }
-                self.display_results()
-                self.display_report()
+                parametros.update({'f': f_expr, 'u0': u0_expr, 'dt': dt, 'n_passos': n_passos})
             else:
                 # Poisson e Helmholtz (estacionárias)
-                p = sp.sympify(self.entry_p.get())
-                q = sp.sympify(self.entry_q.get())
-                r = sp.sympify(self.entry_r.get())
-                f = sp.sympify(self.entry_f.get())
-                edp_params = {'p': p, 'q': q, 'r': r, 'f': f}
-                condicoes_contorno = {'tipo': 'dirichlet', 'valores': (ua, ub)}
-                methods = {
-                    'Rayleigh-Ritz': RayleighRitz,
-                    'Galerkin': Galerkin,
-                    'Colocação': MetodoColocacao,
-                    'Momentos': MetodoMomentos,
-                    'Subdomínios': MetodoSubdominios,
-                    'Mínimos Quadrados': MetodoMinimosQuadrados
-                }
-                for name, method in methods.items():
-                    solver = method((a, b), n_pontos, condicoes_contorno)
-                    solution, coefficients = solver.resolver(edp_params)
-                    self.resultados[name] = {
-                        'solution': solution, 'coefficients': coefficients}
-                self.display_results()
-                self.display_report()
+                parametros.update({'p': self.entry_p.get(), 'q': self.entry_q.get(),
+                                   'r': self.entry_r.get(), 'f': self.entry_f.get()})
         except Exception as e:
             messagebox.showerror("Erro", str(e))
-        finally:
-            pb.stop()
-            progress.destroy()
+            return
+        self.iniciar_execucao(tipo, parametros)
+
+    @staticmethod
+    def assinatura_operador_de(tipo, parametros):
+        # Tudo o que define os operadores estacionários (todos os parâmetros menos f)
+        if tipo not in ("Poisson", "Helmholtz"):
+            return None
+        return tuple(str(parametros[k]) for k in ('a', 'b', 'ua', 'ub', 'n_pontos', 'p', 'q', 'r'))
+
+    def iniciar_execucao(self, tipo, parametros):
+        # Resolve em uma thread de fundo (cada método em um processo separado);
+        # a interface acompanha o progresso por root.after, sem congelar.
+        # Se só f mudou desde a última resolução estacionária, os operadores
+        # fatorados são reaproveitados (só a carga e a substituição são refeitas).
+        metodos = list(METODOS)
+        assinatura = self.assinatura_operador_de(tipo, parametros)
+        reaproveitar = (assinatura is not None and assinatura == self.assinatura_operador
+                        and list(self.solvers) == metodos)
+        execucao = {
+            'metodos': metodos,
+            'assinatura': assinatura,
+            'fila': queue.Queue(),            # notificações da thread de fundo
+            'cancelar': threading.Event(),
+            'fracao': dict.fromkeys(metodos, 0.0),
+            'resultados': None,
+            'falha': None
+        }
+        self.execucao = execucao
+
+        janela = tk.Toplevel(self.root)
+        janela.title('Processando...')
+        janela.geometry('420x150')
+        janela.protocol('WM_DELETE_WINDOW', self.cancelar_execucao)
+        execucao['janela'] = janela
+        tk.Label(janela, text='Resolvendo EDP, aguarde...', font=("Arial", 16)).pack(pady=5)
+        execucao['rotulo'] = tk.Label(janela, text='', font=("Arial", 11))
+        execucao['rotulo'].pack()
+        execucao['barra'] = ttk.Progressbar(janela, mode='determinate', length=380,
+                                            maximum=len(metodos))
+        execucao['barra'].pack(pady=5)
+        execucao['botao'] = ttk.Button(janela, text='Cancelar', command=self.cancelar_execucao)
+        execucao['botao'].pack(pady=5)
+
+        def progresso(metodo, passo, total):
+            execucao['fila'].put((metodo, passo, total))
+
+        def executar():
+            try:
+                if reaproveitar:
+                    execucao['resultados'] = resolver_nova_carga(
+                        self.solvers, parametros['f'], progresso=progresso,
+                        cancelar=execucao['cancelar'])
+                else:
+                    execucao['resultados'] = resolver_todos(
+                        tipo, parametros, metodos, n_processos=self.n_processos,
+                        progresso=progresso, cancelar=execucao['cancelar'],
+                        manter_solver=assinatura is not None)
+            except Exception as e:
+                execucao['falha'] = e
+
+        execucao['thread'] = threading.Thread(target=executar, daemon=True)
+        execucao['thread'].start()
+        self.root.after(INTERVALO_PROGRESSO, self.acompanhar_execucao)
+
+    def cancelar_execucao(self):
+        if self.execucao is not None:
+            self.execucao['cancelar'].set()
+            self.execucao['rotulo'].config(text='Cancelando...')
+            self.execucao['botao'].config(state='disabled')
+
+    def acompanhar_execucao(self):
+        # Executado na thread da interface: consome o progresso e, ao final, os resultados
+        execucao = self.execucao
+        while not execucao['fila'].empty():
+            metodo, passo, total = execucao['fila'].get()
+            execucao['fracao'][metodo] = passo / total if total else 1.0
+            if not execucao['cancelar'].is_set():
+                execucao['rotulo'].config(text=f"{metodo}: {passo}/{total}")
+        execucao['barra']['value'] = sum(execucao['fracao'].values())
+        if execucao['thread'].is_alive():
+            self.root.after(INTERVALO_PROGRESSO, self.acompanhar_execucao)
+            return
+        execucao['janela'].destroy()
+        self.execucao = None
+        if execucao['falha'] is not None:
+            messagebox.showerror("Erro", str(execucao['falha']))
+            return
+        if execucao['cancelar'].is_set():
+            messagebox.showinfo("Cancelado", "A resolução foi cancelada.")
+            return
+        # Só guarda os solvers se todos os métodos tiverem um (senão, resolução completa)
+        solvers = {metodo: resultado['solver'] for metodo, resultado in execucao['resultados'].items()
+                   if resultado['solver'] is not None}
+        completo = execucao['assinatura'] is not None and list(solvers) == execucao['metodos']
+        self.solvers = solvers if completo else {}
+        self.assinatura_operador = execucao['assinatura'] if completo else None
+        # As falhas são reportadas por método
+        for metodo, resultado in execucao['resultados'].items():
+            if resultado['erro'] is None:
+                self.resultados[metodo] = {
+                    'solution': resultado['solution'],
+                    'coefficients': resultado['coefficients'],
+                    'perfil': resultado['perfil'],
+                    'cache': resultado['cache']}
+            else:
+                self.erros[metodo] = resultado['erro']
+        self.display_results()
+        self.display_report()
 
     def display_results(self):
         # Exibe os coeficientes dos métodos na aba de resultados
@@ -500,6 +568,8 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
             self.results_text.insert(
                 tk.END, f"  Coeficientes: {result['coefficients']}\n")
             self.results_text.insert(tk.END, "\n")
+        for name, erro in self.erros.items():
+            self.results_text.insert(tk.END, f"{name}:\n  Erro: {erro}\n\n")
 
         self.notebook.select(self.frame_resultados)
 
@@ -533,15 +603,32 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
                     self.report_text.insert(
                         tk.END, f"Não foi possível comparar {nomes[i]} e {nomes[j]}\n")
         self.report_text.insert(tk.END, '\n')
+        if self.mostrar_perfil.get():
+            from methods.perfil import PerfilExecucao
+            self.report_text.insert(tk.END, 'Tempos por fase:\n')
+            self.report_text.insert(tk.END, '-'*50 + '\n')
+            for name, result in self.resultados.items():
+                if result.get('perfil'):
+                    perfil = PerfilExecucao.de_resumo(result['perfil'])
+                    self.report_text.insert(tk.END, f"{name}:\n")
+                    for linha in perfil.linhas():
+                        self.report_text.insert(tk.END, f"  {linha}\n")
+            self.report_text.insert(tk.END, '\n')
+        # Economia do cache de expressões (derivação/compilação reaproveitadas),
+        # somada sobre os processos dos métodos
+        for nome, uso in somar_uso_cache(self.resultados).items():
+            self.report_text.insert(
+                tk.END, f"Cache de {nome}: {uso['acertos']} acertos, {uso['falhas']} falhas\n")
+        self.report_text.insert(tk.END, '\n')
 
         # Gráfico comparativo das soluções com cores e marcadores
         cores = ['#1f77b4', '#ff7f0e', '#2ca02c',
-                 '#d62728', '#9467bd', '#8c564b']
-        marcadores = ['o', 's', '^', 'D', 'v', 'P']
+                 '#d62728', '#9467bd', '#8c564b', '#e377c2']
+        marcadores = ['o', 's', '^', 'D', 'v', 'P', 'X']
         if self.figura:
             self.figura.clf()
         else:
-            self.figura = plt.Figure(figsize=(6, 4), dpi=100)
+            self.figura = criar_figura(figsize=(6, 4), dpi=100)
         ax = self.figura.add_subplot(111)
         x_plot = None
         for idx, (name, result) in enumerate(self.resultados.items()):
@@ -564,6 +651,7 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
             1, 0.5))  # Legenda na lateral direita
         if self.canvas:
             self.canvas.get_tk_widget().destroy()
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         self.canvas = FigureCanvasTkAgg(
             self.figura, master=self.frame_relatorio)
         self.canvas.draw()
@@ -624,6 +712,12 @@ Desenvolvido por Vinicius Oliveira e Luys Arthur.
             'Onda': r"\dfrac{\partial^2 u}{\partial t^2} = \dfrac{\partial^2 u}{\partial x^2}",
             'Helmholtz': r"-\dfrac{d^2u}{dx^2} + k^2 u = f(x)"
         }.get(tipo, r"-\dfrac{d^2u}{dx^2} = f(x)")
+        if self.equation_canvas is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.equation_fig = criar_figura(figsize=(8, 1.2), dpi=100)
+            self.equation_ax = self.equation_fig.add_subplot(111)
+            self.equation_canvas = FigureCanvasTkAgg(self.equation_fig, master=self.equation_frame)
+            self.equation_canvas.get_tk_widget().pack()
         self.equation_ax.clear()
         self.equation_ax.axis('off')
         self.equation_ax.text(0.5, 0.5, f"${eq_latex}$", fontsize=32, ha='center', va='center')
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from methods import METODOS
+from execucao import resolver_todos
+
+# Execução em lote sem interface gráfica: lê especificações de problemas em JSON
+# e grava os resultados de cada caso em um arquivo .npz compactado.
+#
+# Cada especificação é um objeto como
+#   {"nome": "poisson1", "tipo": "Poisson", "p": "1", "q": "0", "r": "0",
+#    "f": "sin(pi*x)", "a": 0, "b": 1, "ua": 0, "ub": 0, "n_pontos": 20,
+#    "metodos": ["Galerkin", "Colocação"]}
+# e, para Calor/Onda, também "u0", "v0", "dt" e "T_max". Nos problemas
+# estacionários, "tol" ativa o refinamento adaptativo do tamanho da base.
+# O arquivo pode conter um objeto, uma lista de objetos ou um objeto por linha.
+
+TIPOS = ('Poisson', 'Helmholtz', 'Calor', 'Onda')
+
+PADRAO = {
+    'tipo': 'Poisson',
+    'p': '1', 'q': '0', 'r': '0', 'f': '0',
+    'u0': '0', 'v0': '0',
+    'a': 0.0, 'b': 1.0, 'ua': 0.0, 'ub': 0.0,
+    'n_pontos': 20,
+    'dt': 0.01, 'T_max': 1.0,
+    'tol': None
+}
+
+
+def ler_especificacoes(caminho):
+    # Aceita um objeto JSON, uma lista de objetos ou JSON Lines ('-' = entrada padrão)
+    if caminho == '-':
+        texto = sys.stdin.read()
+    else:
+        with open(caminho, encoding='utf-8') as arquivo:
+            texto = arquivo.read()
+    try:
+        dados = json.loads(texto)
+    except json.JSONDecodeError:
+        dados = [json.loads(linha) for linha in texto.splitlines() if linha.strip()]
+    return dados if isinstance(dados, list) else [dados]
+
+
+def validar_nome(nome):
+    # O nome vira o arquivo <nome>.npz dentro de --saida: nada de caminhos
+    nome = str(nome)
+    separadores = {'/', '\\', os.sep} | ({os.altsep} if os.altsep else set())
+    if not nome or nome in ('.', '..') or '\0' in nome or any(s in nome for s in separadores):
+        raise ValueError(f"Nome de caso inválido: {nome!r} (não pode ser vazio, '.', '..' "
+                         f"nem conter separadores de diretório).")
+    return nome
+
+
+def normalizar(especificacao, indice):
+    caso = dict(PADRAO)
+    caso.update(especificacao)
+    if caso['tipo'] not in TIPOS:
+        raise ValueError(f"Tipo de EDP desconhecido: {caso['tipo']}. Use um de {TIPOS}.")
+    caso['metodos'] = list(caso.get('metodos') or METODOS)
+    desconhecidos = [m for m in caso['metodos'] if m not in METODOS]
+    if desconhecidos:
+        raise ValueError(f"Métodos desconhecidos: {desconhecidos}. Use {list(METODOS)}.")
+    caso.setdefault('nome', f"caso_{indice:05d}")
+    caso['nome'] = validar_nome(caso['nome'])
+    for chave in ('p', 'q', 'r', 'f', 'u0', 'v0'):
+        caso[chave] = str(caso[chave])
+    caso['dt'] = float(caso['dt'])
+    if caso['dt'] <= 0 or float(caso['T_max']) <= 0:
+        raise ValueError("dt e T_max devem ser positivos.")
+    caso['n_passos'] = max(1, int(float(caso['T_max']) / caso['dt']))
+    return caso
+
+
+def resolver_caso(caso, destino):
+    # Resolve um caso (métodos em sequência) e grava destino/<nome>.npz com
+    #   x, metodos, solucoes (n_metodos, n_pontos; NaN nas falhas), erros
+    #   e coeficientes_<i> para os problemas estacionários; com "tol", também
+    #   n_base e estimativa (tamanho final e erro estimado de cada método).
+    resultados = resolver_todos(caso['tipo'], caso, caso['metodos'], n_processos=1)
+    n_pontos = int(caso['n_pontos'])
+    solucoes = np.full((len(resultados), n_pontos), np.nan)
+    erros = []
+    arrays = {}
+    n_base = np.zeros(len(resultados), dtype=int)
+    estimativas = np.full(len(resultados), np.nan)
+    for i, (metodo, resultado) in enumerate(resultados.items()):
+        erros.append(resultado['erro'] or '')
+        if resultado['erro'] is None:
+            solucoes[i] = resultado['solution']
+            if isinstance(resultado['coefficients'], np.ndarray):
+                arrays[f"coeficientes_{i}"] = resultado['coefficients']
+            if resultado['adaptativo'] is not None:
+                n_base[i] = resultado['adaptativo']['n_base']
+                estimativas[i] = resultado['adaptativo']['estimativa']
+    if caso['tol'] and caso['tipo'] in ('Poisson', 'Helmholtz'):
+        arrays.update(n_base=n_base, estimativa=estimativas)
+    caminho = os.path.join(destino, f"{caso['nome']}.npz")
+    np.savez_compressed(
+        caminho, x=np.linspace(float(caso['a']), float(caso['b']), n_pontos),
+        metodos=np.array(list(resultados)), solucoes=solucoes, erros=np.array(erros),
+        tipo=np.array(caso['tipo']), especificacao=np.array(json.dumps(caso, ensure_ascii=False)),
+        **arrays)
+    return caso['nome'], sum(1 for e in erros if e)
+
+
+def executar(casos, destino, n_processos=1):
+    # Os casos são distribuídos entre processos; cada caso roda seus métodos em sequência
+    os.makedirs(destino, exist_ok=True)
+    if n_processos <= 1:
+        yield from (resolver_caso(caso, destino) for caso in casos)
+        return
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        yield from executor.map(resolver_caso, casos, [destino] * len(casos),
+                                chunksize=max(1, len(casos) // (4 * n_processos)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resolve em lote problemas de EDP descritos em JSON, sem interface gráfica.")
+    parser.add_argument('especificacoes', nargs='+',
+                        help="arquivos JSON/JSON Lines com os problemas ('-' para a entrada padrão)")
+    parser.add_argument('-o', '--saida', default='resultados',
+                        help="diretório dos arquivos .npz (padrão: resultados)")
+    parser.add_argument('-j', '--processos', type=int, default=1,
+                        help="nº de processos para os casos (padrão: 1)")
+    parser.add_argument('-q', '--silencioso', action='store_true',
+                        help="não imprime o resumo de cada caso")
+    parser.add_argument('--cache', metavar='DIRETORIO',
+                        help="cache em disco dos operadores montados e fatorados (compartilhado entre execuções)")
+    parser.add_argument('--cache-mb', type=float, default=None,
+                        help="tamanho máximo do cache em MiB (padrão: 512)")
+    args = parser.parse_args(argv)
+    if args.cache:
+        from methods.cache_disco import configurar_cache
+        configurar_cache(args.cache, args.cache_mb)
+
+    casos = []
+    for caminho in args.especificacoes:
+        for especificacao in ler_especificacoes(caminho):
+            try:
+                casos.append(normalizar(especificacao, len(casos)))
+            except ValueError as e:
+                parser.error(str(e))
+    nomes = [caso['nome'] for caso in casos]
+    if len(set(nomes)) != len(nomes):
+        parser.error("Os nomes dos casos devem ser únicos.")
+
+    total_falhas = 0
+    for nome, n_falhas in executar(casos, args.saida, args.processos):
+        total_falhas += n_falhas
+        if not args.silencioso:
+            situacao = f"{n_falhas} método(s) com erro" if n_falhas else "ok"
+            print(f"{nome}: {situacao}")
+    return 1 if total_falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
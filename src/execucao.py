@@ -0,0 +1,253 @@
+import os
+import multiprocessing
+import queue
+import numpy as np
+from methods import METODOS
+from methods.perfil import PerfilExecucao, notificar_coletores
+
+# Execução dos métodos numéricos fora da interface gráfica.
+# Cada método roda em um processo separado; os parâmetros são passados como
+# strings/números (picklable) e os resultados voltam como arrays do NumPy.
+
+# Intervalo (s) entre as verificações de progresso/cancelamento do orquestrador
+INTERVALO_CONSULTA = 0.05
+# Nº aproximado de notificações de progresso por método (evita excesso de IPC)
+N_NOTIFICACOES = 100
+# Tempo (s) para um processo encerrado com terminate() sair antes do kill()
+ESPERA_ENCERRAMENTO = 1.0
+
+
+class SolucaoCancelada(Exception):
+    pass
+
+
+def n_processos_padrao():
+    return min(len(METODOS), os.cpu_count() or 1)
+
+
+def _resultado_erro(erro, cancelado=False):
+    return {'solution': None, 'coefficients': None, 'erro': erro, 'cancelado': cancelado, 'perfil': None,
+            'adaptativo': None, 'solver': None, 'cache': None}
+
+
+def _contadores_cache():
+    # Acertos/falhas do cache de derivação/compilação do processo atual
+    from methods.edp_solver_base import estatisticas_cache
+    return {nome: (info['acertos'], info['falhas']) for nome, info in estatisticas_cache().items()}
+
+
+def _uso_cache(antes):
+    # Acertos/falhas desde `antes`: os contadores valem para o processo inteiro
+    return {nome: {'acertos': acertos - antes[nome][0], 'falhas': falhas - antes[nome][1]}
+            for nome, (acertos, falhas) in _contadores_cache().items()}
+
+
+def somar_uso_cache(resultados):
+    # Soma do uso do cache de expressões de todos os métodos (cada um roda no seu processo)
+    total = {}
+    for resultado in resultados.values():
+        for nome, uso in (resultado.get('cache') or {}).items():
+            soma = total.setdefault(nome, {'acertos': 0, 'falhas': 0})
+            soma['acertos'] += uso['acertos']
+            soma['falhas'] += uso['falhas']
+    return total
+
+
+def resolver_metodo(tipo, metodo, parametros, progresso=None, manter_solver=False):
+    # Resolve um único método; qualquer exceção é devolvida em 'erro' para
+    # que a falha de um método não interrompa os demais.
+    # progresso(passo, total) é repassado aos solvers temporais e pode lançar
+    # SolucaoCancelada para interromper a execução. O resultado inclui o
+    # resumo do PerfilExecucao (tempo por fase e agregados dos passos).
+    # Com parametros['tol'], os problemas estacionários escolhem o tamanho da base
+    # por refinamento adaptativo e o relatório volta em 'adaptativo'.
+    # manter_solver=True devolve em 'solver' o solver estacionário, com o operador
+    # fatorado, para resolver_nova_carga.
+    # O resultado inclui em 'cache' os acertos/falhas do cache de expressões do processo
+    adaptativo = solver = None
+    try:
+        cache_antes = _contadores_cache()
+        a, b = float(parametros['a']), float(parametros['b'])
+        ua, ub = float(parametros['ua']), float(parametros['ub'])
+        n_pontos = int(parametros['n_pontos'])
+        with PerfilExecucao(metodo, notificar=False) as perfil:
+            if tipo == "Onda":
+                from time_solvers.onda_1d import solve_onda_1d
+                _, resultados = solve_onda_1d(
+                    parametros['f'], parametros['u0'], parametros['v0'], a, b, ua, ub, n_pontos,
+                    parametros['dt'], parametros['n_passos'], metodo=metodo, progresso=progresso)
+                solucao = np.asarray(resultados[-1], dtype=float)
+                coeficientes = f"máx: {np.max(solucao):.4g}, mín: {np.min(solucao):.4g}"
+            elif tipo == "Calor":
+                from time_solvers.calor_1d import solve_calor_1d
+                _, resultados = solve_calor_1d(
+                    parametros['f'], parametros['u0'], a, b, ua, ub, n_pontos,
+                    parametros['dt'], parametros['n_passos'], metodo=metodo, progresso=progresso)
+                solucao = np.asarray(resultados[-1], dtype=float)
+                coeficientes = f"máx: {np.max(solucao):.4g}, mín: {np.min(solucao):.4g}"
+            else:
+                # Poisson e Helmholtz (estacionárias)
+                import sympy as sp
+                edp_params = {k: sp.sympify(parametros[k]) for k in ('p', 'q', 'r', 'f')}
+                condicoes_contorno = {'tipo': 'dirichlet', 'valores': (ua, ub)}
+                if parametros.get('tol'):
+                    from methods.adaptativo import resolver_adaptativo
+                    solucao, coeficientes, adaptativo = resolver_adaptativo(
+                        metodo, (a, b), n_pontos, condicoes_contorno, edp_params,
+                        tol=float(parametros['tol']))
+                else:
+                    solver = METODOS[metodo]((a, b), n_pontos, condicoes_contorno)
+                    solucao, coeficientes = solver.resolver(edp_params)
+                solucao = np.asarray(solucao, dtype=float)
+                coeficientes = np.asarray(coeficientes, dtype=float)
+                if progresso is not None:
+                    progresso(1, 1)
+        return {'solution': solucao, 'coefficients': coeficientes, 'erro': None, 'cancelado': False,
+                'perfil': perfil.resumo(), 'adaptativo': adaptativo,
+                'solver': solver if manter_solver else None, 'cache': _uso_cache(cache_antes)}
+    except SolucaoCancelada:
+        return _resultado_erro("Cancelado", cancelado=True)
+    except Exception as e:
+        return _resultado_erro(f"{type(e).__name__}: {e}")
+
+
+def _notificar(resultado):
+    # Os coletores de métricas rodam no processo que chamou resolver_todos
+    if resultado['perfil'] is not None:
+        notificar_coletores(PerfilExecucao.de_resumo(resultado['perfil']))
+    return resultado
+
+
+def _notificador(metodo, enviar, cancelar):
+    # Callback de progresso: notifica a cada ~1% dos passos e verifica o cancelamento
+    def progresso(passo, total):
+        if passo != total and passo % max(1, total // N_NOTIFICACOES):
+            return
+        if cancelar is not None and cancelar.is_set():
+            raise SolucaoCancelada()
+        if enviar is not None:
+            enviar(metodo, passo, total)
+    return progresso
+
+
+def contexto_processos():
+    # Os processos nunca são criados por fork: a interface chama resolver_todos de
+    # uma thread de fundo de um processo com Tk e threads, que não deve ser copiado
+    metodos_inicio = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in metodos_inicio else 'spawn')
+
+
+def _resolver_no_processo(tipo, metodo, parametros, fila, manter_solver):
+    # Ponto de entrada dos processos: progresso e resultado voltam pela mesma fila
+    def enviar(metodo, passo, total):
+        fila.put(('progresso', metodo, (passo, total)))
+    resultado = resolver_metodo(tipo, metodo, parametros, _notificador(metodo, enviar, None),
+                                manter_solver)
+    fila.put(('resultado', metodo, resultado))
+
+
+def _encerrar(processos):
+    for processo in processos:
+        if processo.is_alive():
+            processo.terminate()
+    for processo in processos:
+        processo.join(ESPERA_ENCERRAMENTO)
+        if processo.is_alive():
+            processo.kill()
+            processo.join()
+
+
+def resolver_todos(tipo, parametros, metodos=None, n_processos=None, progresso=None, cancelar=None,
+                   manter_solver=False):
+    # Resolve todos os métodos em paralelo, um processo por método (no máximo
+    # n_processos ao mesmo tempo). A latência total fica próxima à do método mais lento.
+    # progresso(metodo, passo, total) é chamado na thread que invocou esta função.
+    # cancelar (ex.: threading.Event) encerra os processos em andamento na hora,
+    # inclusive no meio da montagem de um problema estacionário grande; por isso,
+    # com cancelar, os métodos rodam em processos mesmo com n_processos=1. Sem
+    # cancelar, n_processos=1 executa em sequência no próprio processo.
+    # manter_solver: ver resolver_metodo (os solvers voltam dos processos por pickle).
+    metodos = list(METODOS) if metodos is None else list(metodos)
+    if n_processos is None:
+        n_processos = n_processos_padrao()
+    n_processos = max(1, min(int(n_processos), len(metodos)))
+    if n_processos == 1 and cancelar is None:
+        return {metodo: _notificar(resolver_metodo(
+                    tipo, metodo, parametros, _notificador(metodo, progresso, None), manter_solver))
+                for metodo in metodos}
+
+    contexto = contexto_processos()
+    fila = contexto.Queue()
+    pendentes = list(metodos)
+    ativos = {}
+    resultados = {}
+
+    def receber(mensagem):
+        natureza, metodo, conteudo = mensagem
+        if natureza == 'resultado':
+            resultados[metodo] = _notificar(conteudo)
+        elif progresso is not None:
+            progresso(metodo, *conteudo)
+
+    try:
+        while pendentes or ativos:
+            if cancelar is not None and cancelar.is_set():
+                break
+            while pendentes and len(ativos) < n_processos:
+                metodo = pendentes.pop(0)
+                processo = contexto.Process(target=_resolver_no_processo, daemon=True,
+                                            args=(tipo, metodo, parametros, fila, manter_solver))
+                processo.start()
+                ativos[metodo] = processo
+            try:
+                receber(fila.get(timeout=INTERVALO_CONSULTA))
+            except queue.Empty:
+                # Processos que terminaram: o resultado (se houver) já está na fila
+                encerrados = [metodo for metodo, processo in ativos.items() if not processo.is_alive()]
+                while True:
+                    try:
+                        receber(fila.get_nowait())
+                    except queue.Empty:
+                        break
+                for metodo in encerrados:
+                    if metodo not in resultados:
+                        # Falha do próprio processo (ex.: processo encerrado abruptamente)
+                        resultados[metodo] = _resultado_erro(
+                            f"O processo terminou sem resultado (código {ativos[metodo].exitcode}).")
+            for metodo in [m for m in ativos if m in resultados]:
+                ativos.pop(metodo).join()
+    finally:
+        _encerrar(ativos.values())
+        fila.close()
+        fila.cancel_join_thread()
+    for metodo in metodos:
+        if metodo not in resultados:
+            resultados[metodo] = _resultado_erro("Cancelado", cancelado=True)
+    return {metodo: resultados[metodo] for metodo in metodos}
+
+
+def resolver_nova_carga(solvers, f, progresso=None, cancelar=None):
+    # Só f mudou: reaproveita os solvers de uma resolução com manter_solver=True
+    # (operadores já fatorados), refazendo apenas a carga e a substituição. Roda em
+    # sequência no processo atual; o formato dos resultados é o de resolver_todos.
+    import sympy as sp
+    f = sp.sympify(f)
+    resultados = {}
+    for metodo, solver in solvers.items():
+        if cancelar is not None and cancelar.is_set():
+            resultados[metodo] = _resultado_erro("Cancelado", cancelado=True)
+            continue
+        try:
+            cache_antes = _contadores_cache()
+            with PerfilExecucao(metodo, notificar=False) as perfil:
+                solucao, coeficientes = solver.resolver_f(f)
+            resultados[metodo] = _notificar({
+                'solution': np.asarray(solucao, dtype=float),
+                'coefficients': np.asarray(coeficientes, dtype=float), 'erro': None,
+                'cancelado': False, 'perfil': perfil.resumo(), 'adaptativo': None, 'solver': solver,
+                'cache': _uso_cache(cache_antes)})
+        except Exception as e:
+            resultados[metodo] = _resultado_erro(f"{type(e).__name__}: {e}")
+        if progresso is not None:
+            progresso(metodo, 1, 1)
+    return resultados
@@ -1,11 +1,63 @@
 # src/methods/__init__.py
 
-from .rayleigh_ritz import RayleighRitz
-from .galerkin import Galerkin
-from .colocacao import MetodoColocacao
-from .momentos import MetodoMomentos
-from .subdominios import MetodoSubdominios
-from .minimos_quadrados import MetodoMinimosQuadrados
+from collections.abc import Mapping
+from importlib import import_module
+
+# Os solvers (e, com eles, sympy e scipy) só são importados quando usados:
+# `import methods` e a lista de nomes dos métodos não custam nada.
+_CLASSES = {
+    "RayleighRitz": ".rayleigh_ritz",
+    "Galerkin": ".galerkin",
+    "MetodoColocacao": ".colocacao",
+    "MetodoMomentos": ".momentos",
+    "MetodoSubdominios": ".subdominios",
+    "MetodoMinimosQuadrados": ".minimos_quadrados",
+    "MetodoElementosFinitos": ".elementos_finitos"
+}
+
+
+def _importar_classe(nome):
+    return getattr(import_module(_CLASSES[nome], __name__), nome)
+
+
+class _RegistroMetodos(Mapping):
+    # Nome exibido na interface -> classe do solver, importada no primeiro acesso
+    def __init__(self, nomes):
+        self._nomes = nomes
+
+    def __getitem__(self, metodo):
+        return _importar_classe(self._nomes[metodo])
+
+    def __iter__(self):
+        return iter(self._nomes)
+
+    def __len__(self):
+        return len(self._nomes)
+
+
+# Registro dos métodos pelo nome exibido na interface
+METODOS = _RegistroMetodos({
+    'Rayleigh-Ritz': 'RayleighRitz',
+    'Galerkin': 'Galerkin',
+    'Colocação': 'MetodoColocacao',
+    'Momentos': 'MetodoMomentos',
+    'Subdomínios': 'MetodoSubdominios',
+    'Mínimos Quadrados': 'MetodoMinimosQuadrados',
+    'Elementos Finitos': 'MetodoElementosFinitos'
+})
+
+
+def __getattr__(nome):
+    if nome in _CLASSES:
+        classe = _importar_classe(nome)
+        globals()[nome] = classe
+        return classe
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_CLASSES))
+
 
 __all__ = [
     "RayleighRitz",
@@ -13,5 +65,7 @@ __all__ = [
     "MetodoColocacao",
     "MetodoMomentos",
     "MetodoSubdominios",
-    "MetodoMinimosQuadrados"
-]
\ No newline at end of file
+    "MetodoMinimosQuadrados",
+    "MetodoElementosFinitos",
+    "METODOS"
+]
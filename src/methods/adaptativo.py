@@ -0,0 +1,166 @@
+import time
+import warnings
+import numpy as np
+import sympy as sp
+from . import METODOS
+from .edp_solver_base import FatoracaoBordeada, compilar
+from .perfil import fase
+
+# Refinamento adaptativo do tamanho da base: começa com poucas funções e dobra a
+# base até que a estimativa a posteriori do erro fique abaixo da tolerância.
+#   criterio='diferenca'  ||u_n - u_anterior||∞ / ||u_n||∞ na malha de verificação
+#   criterio='residuo'    RMS(L u_n - f) / RMS(f) na malha de verificação, com a forma
+#                         forte de cada método (EDPSolver.residuo); métodos sem forma
+#                         forte avaliável (elementos finitos, subdomínios) usam 'diferenca'
+# O resíduo forte das bases de senos converge devagar quando f não se anula nas
+# extremidades (u'' = 0 lá), por isso o padrão é a diferença entre níveis.
+
+CRITERIOS = ('diferenca', 'residuo')
+# Pontos da malha uniforme de verificação
+N_VERIFICACAO = 513
+# Limite (s) do refinamento: o próximo nível só é resolvido se o custo previsto
+# (o do último nível vezes fator², otimista para montagens O(n³)) couber nele
+TEMPO_MAXIMO = 60.0
+# Níveis consecutivos sem progresso (estimativa infinita, de sistema singular, ou
+# que não cai abaixo de FATOR_ESTAGNACAO vezes a anterior) que encerram o refinamento
+N_ESTAGNACAO = 2
+FATOR_ESTAGNACAO = 0.9
+
+
+def _norma_relativa(valores, referencia):
+    escala = np.sqrt(np.mean(referencia**2))
+    return np.sqrt(np.mean(valores**2)) / (escala if escala > 0 else 1.0)
+
+
+def resolver_adaptativo(metodo, dominio, n_pontos, condicoes_contorno, edp_params, tol=1e-6,
+                        criterio='diferenca', n_inicial=4, n_maximo=256, fator=2,
+                        n_verificacao=N_VERIFICACAO, tempo_maximo=TEMPO_MAXIMO,
+                        n_estagnacao=N_ESTAGNACAO, **opcoes):
+    # metodo: nome em METODOS ou a classe do solver; opcoes vão para o construtor.
+    # Devolve (solucao na malha de saída, coeficientes, relatório) com o tamanho
+    # final, a estimativa, o resíduo (quando existe) e o custo de cada nível.
+    # O refinamento para cedo, com aviso e relatorio['motivo'], quando o custo
+    # previsto passa de tempo_maximo ou após n_estagnacao níveis sem progresso.
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério desconhecido: {criterio}. Use um de {CRITERIOS}.")
+    if fator < 2:
+        raise ValueError("O fator de crescimento da base deve ser pelo menos 2.")
+    classe = METODOS[metodo] if isinstance(metodo, str) else metodo
+    edp_params = {k: sp.sympify(v) for k, v in edp_params.items()}
+    x_verificacao = np.linspace(dominio[0], dominio[1], n_verificacao)
+    f_verificacao = compilar(edp_params['f'])(x_verificacao)
+
+    historico = []
+    inicio = time.perf_counter()
+    anterior = None
+    melhor = np.inf
+    sem_progresso = 0
+    n_base = max(1, int(n_inicial))
+    while True:
+        t0 = time.perf_counter()
+        solver = classe(dominio, n_pontos, condicoes_contorno, n_base=n_base, **opcoes)
+        solucao, coef = solver.resolver(edp_params)
+        u = solver.reconstruir(coef, x_verificacao)
+        residuo = solver.residuo(edp_params, coef, x_verificacao)
+        if residuo is not None:
+            residuo = _norma_relativa(residuo, f_verificacao)
+        escala = np.max(np.abs(u))
+        sem_referencia = False
+        if escala == 0 and np.any(f_verificacao != 0):
+            # Sistema singular (coeficientes nulos): não conta como convergência
+            estimativa = np.inf
+        elif criterio == 'residuo' and residuo is not None:
+            estimativa = residuo
+        elif anterior is None:
+            estimativa = np.inf
+            sem_referencia = True
+        else:
+            estimativa = np.max(np.abs(u - anterior)) / (escala if escala > 0 else 1.0)
+        historico.append({'n_base': solver.n_base, 'estimativa': float(estimativa),
+                          'residuo': None if residuo is None else float(residuo),
+                          'tempo': time.perf_counter() - t0})
+        convergiu = estimativa <= tol
+        # O 1º nível do critério 'diferenca' ainda não tem com o que comparar
+        if not sem_referencia:
+            progrediu = np.isfinite(estimativa) and estimativa < FATOR_ESTAGNACAO * melhor
+            sem_progresso = 0 if progrediu else sem_progresso + 1
+            melhor = min(melhor, estimativa)
+        custo_previsto = historico[-1]['tempo'] * fator**2
+        if convergiu:
+            motivo = 'convergiu'
+        elif n_base * fator > n_maximo:
+            motivo = 'n_maximo'
+        elif sem_progresso >= n_estagnacao:
+            # Pelo nível atual: um nível anterior finito não torna o sistema atual regular
+            motivo = 'singular' if not np.isfinite(estimativa) else 'estagnou'
+        elif time.perf_counter() - inicio + custo_previsto > tempo_maximo:
+            motivo = 'tempo'
+        else:
+            anterior = u
+            n_base *= fator
+            continue
+        break
+
+    if not convergiu:
+        warnings.warn(f"{classe.__name__}: refinamento adaptativo não convergiu (motivo: {motivo}, "
+                      f"n_base={solver.n_base}, estimativa={historico[-1]['estimativa']:.3g}, tol={tol:g}).")
+
+    relatorio = {'metodo': classe.__name__, 'criterio': criterio, 'tol': tol,
+                 'convergiu': bool(convergiu), 'motivo': motivo, 'n_base': solver.n_base,
+                 'estimativa': historico[-1]['estimativa'], 'residuo': historico[-1]['residuo'],
+                 'n_solucoes': len(historico), 'tempo': time.perf_counter() - inicio,
+                 'historico': historico}
+    return solucao, coef, relatorio
+
+
+def estudo_convergencia(metodo, dominio, n_pontos, condicoes_contorno, edp_params, tamanhos,
+                        n_verificacao=N_VERIFICACAO, **opcoes):
+    # Tabela (uma linha por tamanho crescente) com n_base, coeficientes, solução na
+    # malha de saída, resíduo relativo e tempo de montagem + solução de cada linha.
+    # Bases hierárquicas (senos, monômios, polinômios) montam só a borda nova a cada
+    # tamanho e ampliam a fatoração por blocos; as demais resolvem cada tamanho do zero.
+    classe = METODOS[metodo] if isinstance(metodo, str) else metodo
+    tamanhos = sorted({int(n) for n in tamanhos})
+    edp_params = {k: sp.sympify(v) for k, v in edp_params.items()}
+    x_verificacao = np.linspace(dominio[0], dominio[1], n_verificacao)
+    f_verificacao = compilar(edp_params['f'])(x_verificacao)
+
+    def tabela(solver, n_base, coef, coef_base, tempos):
+        # coef_base: coeficientes na base do solver (uma linha por tamanho ou um vetor)
+        residuos = solver.residuo(edp_params, coef_base, x_verificacao)
+        solucoes = np.atleast_2d(solver.reconstruir(coef_base))
+        if residuos is not None:
+            residuos = np.atleast_2d(residuos)
+        return [{'n_base': n_base[k], 'coeficientes': coef[k], 'solucao': solucoes[k],
+                 'residuo': None if residuos is None else float(_norma_relativa(residuos[k], f_verificacao)),
+                 'tempo': tempos[k]}
+                for k in range(len(coef))]
+
+    solver = classe(dominio, n_pontos, condicoes_contorno, n_base=tamanhos[-1], **opcoes)
+    montagem = solver.montagem_incremental(edp_params)
+    if montagem is None:
+        linhas = []
+        for n in tamanhos:
+            t0 = time.perf_counter()
+            solver = classe(dominio, n_pontos, condicoes_contorno, n_base=n, **opcoes)
+            _, coef = solver.resolver(edp_params)
+            linhas += tabela(solver, [solver.n_base], [coef], coef, [time.perf_counter() - t0])
+        return linhas
+
+    # Carga do maior tamanho: as n primeiras entradas são a carga da base de tamanho n
+    t0 = time.perf_counter()
+    b_vec = solver.montar_carga(edp_params)
+    fatoracao = FatoracaoBordeada(solver.n_base)
+    coef_base = np.zeros((len(tamanhos), solver.n_base))
+    tempos = []
+    for k, n in enumerate(tamanhos):
+        with fase('montagem'):
+            A = montagem.ampliar(n)
+        with fase('solucao'):
+            coef_base[k, :n] = fatoracao.ampliar(A).resolver(b_vec[:n])
+        tempos.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+    # Na base hierárquica os coeficientes completados com zeros representam a mesma
+    # u_h: soluções e resíduos de todos os tamanhos saem de uma única avaliação da base
+    return tabela(solver, tamanhos, [coef_base[k, :n] for k, n in enumerate(tamanhos)],
+                  coef_base, tempos)
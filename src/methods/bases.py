@@ -0,0 +1,334 @@
+from functools import lru_cache
+import numpy as np
+from numpy.polynomial import chebyshev
+from scipy.fft import dct, dst
+from .edp_solver_base import compilar
+
+
+# Avaliação numérica das funções base e de suas derivadas.
+# Toda base é um objeto chamável base(x_vals, ordem) que devolve um array
+# (n_base, len(x_vals)) com a derivada de ordem `ordem` de cada função.
+# base.chave() identifica as funções pelo valor (duas instâncias iguais têm a
+# mesma chave) e entra nas chaves das amostras e dos operadores reaproveitados.
+
+
+class BaseSenos:
+    # phi_i(x) = sin(i*pi*(x - a)/(b - a)), i = 1..n_base
+    def __init__(self, dominio, n_base):
+        self.dominio = dominio
+        self.n_base = n_base
+        a, b = dominio
+        self.k = np.arange(1, n_base + 1) * np.pi / (b - a)
+
+    def __call__(self, x_vals, ordem=0):
+        x_vals = np.asarray(x_vals, dtype=float)
+        arg = np.outer(self.k, x_vals - self.dominio[0])
+        valores = np.sin(arg) if ordem % 2 == 0 else np.cos(arg)
+        sinal = (-1) ** (ordem // 2)
+        return sinal * self.k[:, None] ** ordem * valores
+
+    def chave(self):
+        return ('senos', tuple(self.dominio), self.n_base)
+
+    def combinar(self, coef, x_vals, ordem=0):
+        # u(x) = Σ c_i φ_i(x); na malha uniforme [a, b] com pelo menos n_base + 2
+        # pontos, os valores saem de uma DST-I em O(n log n)
+        x_vals = np.asarray(x_vals, dtype=float)
+        if ordem == 0 and malha_uniforme(x_vals, self.dominio) and x_vals.size >= self.n_base + 2:
+            return senos_para_nos(coef, x_vals.size)
+        return np.asarray(coef) @ self(x_vals, ordem)
+
+
+def malha_uniforme(x_vals, dominio):
+    # x_vals = linspace(a, b, n) (a malha de saída dos solvers)?
+    if x_vals.ndim != 1 or x_vals.size < 3:
+        return False
+    a, b = dominio
+    h = (b - a) / (x_vals.size - 1)
+    return (x_vals[0] == a and x_vals[-1] == b
+            and np.allclose(np.diff(x_vals), h, rtol=0, atol=1e-12 * max(1.0, abs(b - a))))
+
+
+def senos_para_nos(coef, n_pontos):
+    # Coeficientes de sin(iπ(x - a)/(b - a)), i = 1..n_base, -> valores nos n_pontos
+    # pontos da malha uniforme (zero nas extremidades). DST-I ao longo do último eixo.
+    coef = np.asarray(coef, dtype=float)
+    n_interior = n_pontos - 2
+    if coef.shape[-1] < n_interior:
+        coef = np.concatenate(
+            [coef, np.zeros(coef.shape[:-1] + (n_interior - coef.shape[-1],))], axis=-1)
+    valores = np.zeros(coef.shape[:-1] + (n_pontos,))
+    valores[..., 1:-1] = dst(coef, type=1, axis=-1) / 2
+    return valores
+
+
+def nos_para_senos(valores):
+    # Inversa de senos_para_nos: valores na malha uniforme (com as extremidades)
+    # -> coeficientes dos n_pontos - 2 senos que os interpolam nos pontos interiores
+    valores = np.asarray(valores, dtype=float)
+    return dst(valores[..., 1:-1], type=1, axis=-1) / (valores.shape[-1] - 1)
+
+
+class BaseMonomios:
+    # phi_i(x) = x**i, i = 0..n_base-1
+    def __init__(self, n_base):
+        self.n_base = n_base
+
+    def __call__(self, x_vals, ordem=0):
+        x_vals = np.asarray(x_vals, dtype=float)
+        i = np.arange(self.n_base)
+        fator = np.ones(self.n_base)
+        for m in range(ordem):
+            fator *= i - m
+        expoente = np.maximum(i - ordem, 0)
+        return fator[:, None] * x_vals[None, :] ** expoente[:, None]
+
+    def chave(self):
+        return ('monomios', self.n_base)
+
+    def combinar(self, coef, x_vals, ordem=0):
+        return np.asarray(coef) @ self(x_vals, ordem)
+
+
+class BaseSimbolica:
+    # Funções base arbitrárias dadas como expressões do SymPy em x
+    def __init__(self, funcoes):
+        self.funcoes = funcoes
+        self.n_base = len(funcoes)
+
+    def __call__(self, x_vals, ordem=0):
+        return np.array([compilar(phi, ordem)(x_vals) for phi in self.funcoes])
+
+    def chave(self):
+        return ('simbolica',) + tuple(self.funcoes)
+
+    def combinar(self, coef, x_vals, ordem=0):
+        return np.asarray(coef) @ self(x_vals, ordem)
+
+
+FAMILIAS_POLINOMIAIS = ('legendre', 'chebyshev', 'legendre_integrada')
+
+
+def _recorrencia(familia, n, t, ordem=0):
+    # Derivada `ordem` (em t) de P_0..P_{n-1} pela recorrência de três termos
+    #   P_{k+1} = α_k t P_k - β_k P_{k-1}
+    # derivada m vezes: P_{k+1}^(m) = α_k (t P_k^(m) + m P_k^(m-1)) - β_k P_{k-1}^(m)
+    anterior = None
+    for m in range(ordem + 1):
+        P = np.zeros((n, t.size))
+        P[0] = 1.0 if m == 0 else 0.0
+        if n > 1:
+            P[1] = t if m == 0 else (1.0 if m == 1 else 0.0)
+        for k in range(1, n - 1):
+            if familia == 'chebyshev':
+                alfa, beta = 2.0, 1.0
+            else:
+                alfa, beta = (2 * k + 1) / (k + 1), k / (k + 1)
+            P[k + 1] = alfa * t * P[k] - beta * P[k - 1]
+            if m:
+                P[k + 1] += alfa * m * anterior[k]
+        anterior = P
+    return anterior
+
+
+class BasePolinomial:
+    # Polinômios ortogonais de [-1, 1] mapeados em [a, b], avaliados por recorrência:
+    #   'legendre'            P_0 .. P_{n-1}
+    #   'chebyshev'           T_0 .. T_{n-1}
+    #   'legendre_integrada'  (P_k - P_{k+2}) / sqrt(4k + 6), k = 0..n-1, nulos em
+    #                         x = a e x = b (base adaptada ao contorno de Shen)
+    # contorno=True usa Q_k - Q_{k+2} também para legendre e chebyshev, de modo que
+    # toda função se anula nas extremidades (parte homogênea das condições de Dirichlet).
+    def __init__(self, dominio, n_base, familia='legendre', contorno=False):
+        if familia not in FAMILIAS_POLINOMIAIS:
+            raise ValueError(f"Família polinomial desconhecida: {familia}. Use uma de {FAMILIAS_POLINOMIAIS}.")
+        self.dominio = dominio
+        self.n_base = n_base
+        self.familia = familia
+        self.contorno = contorno or familia == 'legendre_integrada'
+        a, b = dominio
+        self.escala = 2 / (b - a)
+
+    def __call__(self, x_vals, ordem=0):
+        a, b = self.dominio
+        t = (2 * np.asarray(x_vals, dtype=float) - (a + b)) / (b - a)
+        if not self.contorno:
+            return _recorrencia(self.familia, self.n_base, t, ordem) * self.escala**ordem
+        familia = 'chebyshev' if self.familia == 'chebyshev' else 'legendre'
+        P = _recorrencia(familia, self.n_base + 2, t, ordem)
+        valores = P[:-2] - P[2:]
+        if self.familia == 'legendre_integrada':
+            valores /= np.sqrt(4 * np.arange(self.n_base) + 6)[:, None]
+        return valores * self.escala**ordem
+
+    def chave(self):
+        return ('polinomial', tuple(self.dominio), self.n_base, self.familia, self.contorno)
+
+    def combinar(self, coef, x_vals, ordem=0):
+        return np.asarray(coef) @ self(x_vals, ordem)
+
+
+class BaseLagrange:
+    # Funções chapéu de Lagrange (grau 1 ou 2) numa malha uniforme de n_elementos,
+    # associadas aos nós interiores (Dirichlet homogêneo nas extremidades).
+    # Nó global k em x = a + k*h/grau; o elemento e usa os nós grau*e .. grau*e + grau.
+    def __init__(self, dominio, n_elementos, grau=1):
+        if grau not in (1, 2):
+            raise ValueError("Elementos de Lagrange disponíveis: grau 1 ou 2.")
+        self.dominio = dominio
+        self.n_elementos = n_elementos
+        self.grau = grau
+        self.h = (dominio[1] - dominio[0]) / n_elementos
+        self.n_nos = grau * n_elementos + 1
+        self.n_base = self.n_nos - 2
+        # conectividade (n_elementos, grau + 1) em numeração global
+        self.conectividade = grau * np.arange(n_elementos)[:, None] + np.arange(grau + 1)[None, :]
+
+    def forma(self, xi, ordem=0):
+        # Funções de forma no elemento de referência [-1, 1] e derivadas em x:
+        # array (grau + 1, *xi.shape)
+        xi = np.asarray(xi, dtype=float)
+        escala = (2 / self.h) ** ordem
+        if self.grau == 1:
+            if ordem == 0:
+                return np.array([(1 - xi) / 2, (1 + xi) / 2])
+            valores = np.array([-0.5, 0.5]) if ordem == 1 else np.zeros(2)
+        else:
+            if ordem == 0:
+                return np.array([xi * (xi - 1) / 2, 1 - xi**2, xi * (xi + 1) / 2])
+            if ordem == 1:
+                return escala * np.array([xi - 0.5, -2 * xi, xi + 0.5])
+            valores = np.array([1.0, -2.0, 1.0]) if ordem == 2 else np.zeros(3)
+        return escala * valores.reshape((-1,) + (1,) * xi.ndim) * np.ones_like(xi)
+
+    def localizar(self, x_vals):
+        # Elemento que contém cada ponto e a coordenada de referência correspondente
+        x_vals = np.asarray(x_vals, dtype=float)
+        a = self.dominio[0]
+        elemento = np.clip(((x_vals - a) // self.h).astype(int), 0, self.n_elementos - 1)
+        xi = 2 * (x_vals - a - elemento * self.h) / self.h - 1
+        return elemento, xi
+
+    def combinar(self, coef, x_vals, ordem=0):
+        # u(x) = Σ c_i φ_i(x) sem montar a matriz densa da base; coef pode ser 2-D
+        coef = np.asarray(coef, dtype=float)
+        completo = np.zeros(coef.shape[:-1] + (self.n_nos,))
+        completo[..., 1:-1] = coef
+        elemento, xi = self.localizar(x_vals)
+        nos = self.conectividade[elemento]            # (n_x, grau + 1)
+        return np.einsum('...xa,ax->...x', completo[..., nos], self.forma(xi, ordem))
+
+    def __call__(self, x_vals, ordem=0):
+        # Matriz densa (n_base, len(x)): use apenas em malhas pequenas
+        x_vals = np.asarray(x_vals, dtype=float)
+        elemento, xi = self.localizar(x_vals)
+        valores = np.zeros((self.n_nos, x_vals.size))
+        colunas = np.arange(x_vals.size)
+        for local, forma in enumerate(self.forma(xi, ordem)):
+            np.add.at(valores, (self.conectividade[elemento, local], colunas), forma)
+        return valores[1:-1]
+
+    def chave(self):
+        return ('lagrange', tuple(self.dominio), self.n_elementos, self.grau)
+
+
+@lru_cache(maxsize=32)
+def _diferenciacao_chebyshev(n):
+    # Nós de Chebyshev-Gauss-Lobatto t_j = cos(jπ/n) em [-1, 1] e a matriz de
+    # diferenciação D (Trefethen, Spectral Methods in MATLAB, cheb.m) e D²
+    t = np.cos(np.pi * np.arange(n + 1) / n)
+    c = np.ones(n + 1)
+    c[0] = c[-1] = 2
+    c *= (-1) ** np.arange(n + 1)
+    dt = t[:, None] - t[None, :]
+    D = np.outer(c, 1 / c) / (dt + np.eye(n + 1))
+    D -= np.diag(D.sum(axis=1))
+    for matriz in (t, D):
+        matriz.flags.writeable = False
+    D2 = D @ D
+    D2.flags.writeable = False
+    return t, D, D2
+
+
+class BaseChebyshevLobatto:
+    # Funções cardinais (Lagrange) nos nós interiores de Chebyshev-Gauss-Lobatto
+    # mapeados em [a, b]: o coeficiente de cada função é o valor nodal.
+    # Valores nodais <-> coeficientes de Chebyshev pela DCT-I (O(n log n)).
+    def __init__(self, dominio, n):
+        self.dominio = dominio
+        self.n = n                      # grau do polinômio (n + 1 nós)
+        self.n_base = n - 1
+        a, b = dominio
+        self.escala = 2 / (b - a)
+        t, _, _ = _diferenciacao_chebyshev(n)
+        self.nos = 0.5 * (a + b) + t / self.escala
+
+    def diferenciacao(self, ordem=1):
+        # Matriz de diferenciação em [a, b] sobre todos os n + 1 nós
+        _, D, D2 = _diferenciacao_chebyshev(self.n)
+        return (D * self.escala) if ordem == 1 else (D2 * self.escala**2)
+
+    def _referencia(self, x_vals):
+        a, b = self.dominio
+        return (2 * np.asarray(x_vals, dtype=float) - (a + b)) / (b - a)
+
+    def coeficientes(self, valores):
+        # Valores nos n + 1 nós (último eixo) -> coeficientes de Chebyshev
+        coef = dct(np.asarray(valores, dtype=float), type=1, axis=-1) / self.n
+        coef[..., 0] /= 2
+        coef[..., -1] /= 2
+        return coef
+
+    def valores(self, coef):
+        # Inversa de coeficientes(): coeficientes de Chebyshev -> valores nodais
+        a = np.array(coef, dtype=float) / 2
+        a[..., 0] *= 2
+        a[..., -1] *= 2
+        return dct(a, type=1, axis=-1)
+
+    def completar(self, coef):
+        # Valores interiores -> todos os nós (zero nas extremidades)
+        coef = np.asarray(coef, dtype=float)
+        completo = np.zeros(coef.shape[:-1] + (self.n + 1,))
+        completo[..., 1:-1] = coef
+        return completo
+
+    def combinar(self, coef, x_vals, ordem=0):
+        # u(x) = Σ c_i φ_i(x) via DCT + Clenshaw; coef pode ser 2-D
+        serie = np.moveaxis(self.coeficientes(self.completar(coef)), -1, 0)
+        if ordem:
+            serie = chebyshev.chebder(serie, ordem, scl=self.escala, axis=0)
+        return chebyshev.chebval(self._referencia(x_vals), serie)
+
+    def __call__(self, x_vals, ordem=0):
+        return self.combinar(np.eye(self.n_base), x_vals, ordem)
+
+    def chave(self):
+        return ('chebyshev_lobatto', tuple(self.dominio), self.n)
+
+
+def matrizes_senos(dominio, n_base):
+    # Integrais exatas da base de senos (diagonais): massa ∫φiφj e rigidez ∫φi'φj'
+    a, b = dominio
+    L = b - a
+    k = np.arange(1, n_base + 1) * np.pi / L
+    massa = np.full(n_base, L / 2)
+    rigidez = k**2 * L / 2
+    return massa, rigidez
+
+
+def matriz_conveccao_senos(n_base):
+    # C[i, j] = ∫ φi' φj dx = 2ij/(j² - i²) se i + j ímpar, 0 caso contrário
+    i = np.arange(1, n_base + 1)[:, None]
+    j = np.arange(1, n_base + 1)[None, :]
+    impar = (i + j) % 2 == 1
+    return np.where(impar, 2.0 * i * j / np.where(impar, j**2 - i**2, 1), 0.0)
+
+
+def projetar_senos(expr, dominio, n_base):
+    # Coeficientes da projeção L2 de expr na base de senos (massa diagonal)
+    from .quadratura import QuadraturaGaussLegendre, n_nos_padrao
+    a, b = dominio
+    quad_gl = QuadraturaGaussLegendre(a, b, n_nos_padrao(n_base))
+    massa, _ = matrizes_senos(dominio, n_base)
+    return quad_gl.vetor(BaseSenos(dominio, n_base)(quad_gl.x), compilar(expr)(quad_gl.x)) / massa
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import sympy as sp
+from scipy import sparse
+from .edp_solver_base import fatorar_matriz, parametros_livres, valores_parametros
+
+# Cache em disco (endereçado por conteúdo) dos operadores montados e de suas
+# fatorações. A chave é o sha256 de uma descrição canônica do problema: classe do
+# método, srepr de p, q e r e os atributos do solver que definem o operador
+# (domínio, base, n_base, quadratura...). Cada entrada é um diretório com arquivos
+# .npy lidos com mmap_mode='r' e um info.json; o mtime do diretório marca o último
+# uso e, acima do tamanho máximo, as entradas menos usadas são removidas (LRU).
+#
+# Desativado por padrão: configurar_cache(diretorio) ou a variável de ambiente
+# EDP_SOLVER_CACHE (herdada pelos processos de execucao.py) ativam o cache.
+
+VARIAVEL_AMBIENTE = 'EDP_SOLVER_CACHE'
+VARIAVEL_TAMANHO = 'EDP_SOLVER_CACHE_MB'
+TAMANHO_MAXIMO_MB = 512
+# Muda quando o formato das entradas ou a montagem dos operadores muda
+VERSAO = 1
+# Atributos do solver que não afetam o operador (malha de saída, diagnósticos)
+IGNORADOS = {'x', 'n_pontos', 'condicoes_contorno', 'desvio_quad', 'verificar_quad',
+             '_operador_montado', '_fatoracao', '_coeficientes', '_edp_params', '_funcional',
+             '_amostras_quadratura'}
+
+_cache = None
+_configurado = False
+
+
+def _descrever(valor):
+    # Descrição canônica (JSON) de um atributo do solver
+    if valor is None or isinstance(valor, (bool, str)):
+        return valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        # 1 e 1.0 descrevem o mesmo domínio
+        return repr(float(valor))
+    if isinstance(valor, sp.Basic):
+        return sp.srepr(valor)
+    if isinstance(valor, np.ndarray):
+        return [str(valor.dtype), list(valor.shape),
+                hashlib.sha256(np.ascontiguousarray(valor).tobytes()).hexdigest()]
+    if isinstance(valor, (list, tuple)):
+        return [_descrever(v) for v in valor]
+    if isinstance(valor, dict):
+        return {str(k): _descrever(v) for k, v in sorted(valor.items(), key=lambda item: str(item[0]))}
+    if hasattr(valor, '__dict__'):
+        return {'classe': type(valor).__name__, 'atributos': _descrever(vars(valor))}
+    return repr(valor)
+
+
+def chave_operador(solver, edp_params):
+    atributos = {nome: valor for nome, valor in vars(solver).items() if nome not in IGNORADOS}
+    descricao = {
+        'versao': VERSAO,
+        'metodo': f"{type(solver).__module__}.{type(solver).__qualname__}",
+        'coeficientes': [sp.srepr(sp.sympify(edp_params[k])) for k in ('p', 'q', 'r')],
+        'solver': _descrever(atributos),
+    }
+    # Parâmetros livres de p, q, r entram com os valores atuais (sem eles a chave não muda)
+    livres = sorted(set().union(*(parametros_livres(edp_params[k]) for k in ('p', 'q', 'r'))))
+    if livres:
+        descricao['parametros'] = dict(zip(livres, map(_descrever, valores_parametros(livres))))
+    texto = json.dumps(descricao, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(texto.encode('ascii')).hexdigest()
+
+
+def _serializar(A, fatoracao):
+    # (info, arrays) de uma entrada; a LU esparsa (SuperLU) não é serializável e
+    # é refeita a partir da matriz (O(n) para as matrizes de banda)
+    tipo, fator = fatoracao
+    info = {'tipo': tipo, 'esparsa': sparse.issparse(A), 'forma': list(A.shape)}
+    if info['esparsa']:
+        A = sparse.csr_matrix(A)
+        arrays = {'A_dados': A.data, 'A_indices': A.indices, 'A_ponteiros': A.indptr}
+    else:
+        arrays = {'A': np.asarray(A)}
+    if tipo == 'diagonal':
+        arrays['diagonal'] = fator
+    elif tipo == 'cholesky':
+        arrays['cholesky'] = fator[0]
+        info['inferior'] = bool(fator[1])
+    elif tipo == 'lu':
+        arrays['lu'], arrays['pivos'] = fator
+    return info, arrays
+
+
+def _desserializar(info, arrays):
+    if info['esparsa']:
+        A = sparse.csr_matrix((arrays['A_dados'], arrays['A_indices'], arrays['A_ponteiros']),
+                              shape=tuple(info['forma']))
+    else:
+        A = arrays['A']
+    tipo = info['tipo']
+    if tipo == 'diagonal':
+        return A, ('diagonal', arrays['diagonal'])
+    if tipo == 'cholesky':
+        return A, ('cholesky', (arrays['cholesky'], info['inferior']))
+    if tipo == 'lu':
+        return A, ('lu', (arrays['lu'], arrays['pivos']))
+    # SuperLU não é serializável; matrizes singulares são refatoradas para repetir o
+    # aviso (e entradas antigas de matrizes só mal condicionadas voltam a ter a LU)
+    return A, fatorar_matriz(A)
+
+
+class CacheDisco:
+    def __init__(self, diretorio, tamanho_maximo_mb=TAMANHO_MAXIMO_MB):
+        self.diretorio = os.path.abspath(os.path.expanduser(diretorio))
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.acertos = 0
+        self.falhas = 0
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave)
+
+    def carregar(self, chave):
+        # (A, fatoracao) ou None; as matrizes ficam mapeadas em memória (somente leitura)
+        caminho = self._caminho(chave)
+        try:
+            with open(os.path.join(caminho, 'info.json'), encoding='utf-8') as arquivo:
+                info = json.load(arquivo)
+            arrays = {nome: np.load(os.path.join(caminho, f"{nome}.npy"), mmap_mode='r')
+                      for nome in info['arrays']}
+            # Só as matrizes ficam mapeadas: vetores pequenos (pivôs, diagonal, índices)
+            # vão para a memória (lu_solve falha com pivôs num memmap somente leitura)
+            arrays = {nome: array if array.ndim == 2 else np.array(array)
+                      for nome, array in arrays.items()}
+            os.utime(caminho)
+        except (OSError, ValueError, KeyError):
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        return _desserializar(info, arrays)
+
+    def gravar(self, chave, A, fatoracao):
+        # Escreve num diretório temporário e renomeia: leitores concorrentes (outros
+        # processos) nunca veem uma entrada incompleta
+        caminho = self._caminho(chave)
+        if os.path.isdir(caminho):
+            return
+        info, arrays = _serializar(A, fatoracao)
+        info['arrays'] = sorted(arrays)
+        temporario = f"{caminho}.tmp-{os.getpid()}"
+        try:
+            os.makedirs(temporario, exist_ok=True)
+            for nome, array in arrays.items():
+                np.save(os.path.join(temporario, f"{nome}.npy"), np.asarray(array))
+            with open(os.path.join(temporario, 'info.json'), 'w', encoding='utf-8') as arquivo:
+                json.dump(info, arquivo)
+            os.rename(temporario, caminho)
+        except OSError:
+            shutil.rmtree(temporario, ignore_errors=True)
+            return
+        self.reduzir()
+
+    def entradas(self):
+        # [(último uso, bytes, caminho)] das entradas completas
+        entradas = []
+        with os.scandir(self.diretorio) as itens:
+            for item in itens:
+                if not item.is_dir() or '.tmp-' in item.name:
+                    continue
+                try:
+                    tamanho = sum(arquivo.stat().st_size for arquivo in os.scandir(item.path))
+                    entradas.append((item.stat().st_mtime, tamanho, item.path))
+                except OSError:
+                    continue
+        return entradas
+
+    def tamanho(self):
+        return sum(tamanho for _, tamanho, _ in self.entradas())
+
+    def reduzir(self):
+        # Remove as entradas usadas há mais tempo até caber no tamanho máximo
+        entradas = sorted(self.entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            shutil.rmtree(caminho, ignore_errors=True)
+            total -= tamanho
+
+    def limpar(self):
+        for _, _, caminho in self.entradas():
+            shutil.rmtree(caminho, ignore_errors=True)
+
+
+def configurar_cache(diretorio, tamanho_maximo_mb=None):
+    # Ativa (ou, com diretorio=None, desativa) o cache do processo atual e dos
+    # processos criados depois (via variáveis de ambiente)
+    global _cache, _configurado
+    _configurado = True
+    if diretorio is None:
+        _cache = None
+        os.environ.pop(VARIAVEL_AMBIENTE, None)
+        return None
+    if tamanho_maximo_mb is None:
+        tamanho_maximo_mb = float(os.environ.get(VARIAVEL_TAMANHO, TAMANHO_MAXIMO_MB))
+    _cache = CacheDisco(diretorio, tamanho_maximo_mb)
+    os.environ[VARIAVEL_AMBIENTE] = _cache.diretorio
+    os.environ[VARIAVEL_TAMANHO] = str(tamanho_maximo_mb)
+    return _cache
+
+
+def cache_ativo():
+    global _cache, _configurado
+    if not _configurado:
+        _configurado = True
+        diretorio = os.environ.get(VARIAVEL_AMBIENTE)
+        if diretorio:
+            _cache = CacheDisco(diretorio, float(os.environ.get(VARIAVEL_TAMANHO, TAMANHO_MAXIMO_MB)))
+    return _cache
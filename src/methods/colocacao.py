@@ -1,69 +1,70 @@
 import numpy as np
-import sympy as sp
-from scipy.integrate import quad
-from numpy.linalg import solve
+from .edp_solver_base import EDPSolver, compilar
+from .bases import BaseSenos, BaseChebyshevLobatto, nos_para_senos
 
+MODOS_COLOCACAO = ('senos', 'chebyshev')
 
-class MetodoColocacao:
-    def __init__(self, dominio, n_pontos, condicoes_contorno):
-        self.dominio = dominio
-        self.n_pontos = n_pontos
-        self.condicoes_contorno = condicoes_contorno
-        self.x_col = np.linspace(dominio[0], dominio[1], n_pontos)[1:-1]
-        self.n_col = len(self.x_col)
-        self.phi_base = self._gerar_funcoes_base()
-
-    def _gerar_funcoes_base(self):
-        x = sp.Symbol('x')
-        phi_base = []
-        for i in range(1, self.n_col + 1):
-            phi = sp.sin(
-                i * sp.pi * (x - self.dominio[0]) / (self.dominio[1] - self.dominio[0]))
-            phi_base.append(phi)
-        return phi_base
-
-    def resolver(self, edp_params):
-        x = sp.Symbol('x')
-        if not isinstance(edp_params['f'], sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
 
-        a, b = self.dominio
-
-        A = np.zeros((self.n_col, self.n_col))
-        b_vec = np.zeros(self.n_col)
+class MetodoColocacao(EDPSolver):
+    # modo='senos': senos em pontos equiespaçados (original)
+    # modo='chebyshev': colocação espectral nos nós de Chebyshev-Gauss-Lobatto com
+    # n_cheb + 1 nós (padrão n_pontos - 1); as incógnitas são os valores nos nós interiores.
+    # n_base fixa o nº de pontos de colocação independentemente da malha de saída.
+    def __init__(self, dominio, n_pontos, condicoes_contorno, modo='senos', n_cheb=None,
+                 n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno)
+        if modo not in MODOS_COLOCACAO:
+            raise ValueError(f"Modo de colocação desconhecido: {modo}. Use um de {MODOS_COLOCACAO}.")
+        self.modo = modo
+        if modo == 'chebyshev':
+            n_cheb = n_cheb or (n_base + 1 if n_base else n_pontos - 1)
+            self.base_chebyshev = BaseChebyshevLobatto(dominio, max(2, n_cheb))
+            self.x_col = self.base_chebyshev.nos[1:-1]
+        else:
+            n_col = n_base or n_pontos - 2
+            self.x_col = np.linspace(dominio[0], dominio[1], n_col + 2)[1:-1]
+        self.n_col = len(self.x_col)
+        self.n_base = self.n_col
 
-        for i, x_i in enumerate(self.x_col):
-            for j in range(self.n_col):
-                phi_j = self.phi_base[j]
-                Lu_j = (edp_params['p'] * sp.diff(phi_j, x, 2) +
-                        edp_params['q'] * sp.diff(phi_j, x) +
-                        edp_params['r'] * phi_j)
+    def _base_tentativa(self):
+        if self.modo == 'chebyshev':
+            return self.base_chebyshev
+        return BaseSenos(self.dominio, self.n_col)
 
-                Lu_j_func = sp.lambdify(x, Lu_j, 'numpy')
-                try:
-                    A[i, j] = Lu_j_func(x_i)
-                except:
-                    A[i, j] = 0
+    def _operador_chebyshev(self, edp_params):
+        # L = diag(p) D² + diag(q) D + diag(r) em todos os nós; as linhas de contorno
+        # dariam u = 0 (Dirichlet homogêneo), então os valores de contorno são
+        # eliminados e resta o bloco interior
+        base = self.base_chebyshev
+        nos = base.nos
+        p, q, r = (compilar(edp_params[k])(nos) for k in ('p', 'q', 'r'))
+        L = p[:, None] * base.diferenciacao(2) + q[:, None] * base.diferenciacao(1) + np.diag(r)
+        return L[1:-1, 1:-1]
 
-            f_func = sp.lambdify(x, edp_params['f'], 'numpy')
-            try:
-                b_vec[i] = f_func(x_i)
-            except:
-                b_vec[i] = 0
+    def montar_operador(self, edp_params):
+        if self.modo == 'chebyshev':
+            return self._operador_chebyshev(edp_params)
+        # L φj = p φj'' + q φj' + r φj para todos os j em todos os pontos de uma vez:
+        # os coeficientes são avaliados nos pontos de colocação e multiplicam as
+        # derivadas da base (já vetorizadas), sem derivação simbólica por par (i, j)
+        base = self._base_tentativa()
+        p, q, r = (compilar(edp_params[k])(self.x_col) for k in ('p', 'q', 'r'))
+        return (p[:, None] * base(self.x_col, 2).T + q[:, None] * base(self.x_col, 1).T +
+                r[:, None] * base(self.x_col, 0).T)
 
-        try:
-            coef = solve(A, b_vec)
-        except:
-            coef = np.zeros(self.n_col)
+    def montar_carga(self, edp_params):
+        # f avaliada diretamente nos pontos de colocação
+        return compilar(edp_params['f'])(self.x_col)
 
-        # Calcula a solução aproximada nos pontos do domínio
-        x_vals = np.linspace(a, b, self.n_pontos)
-        resultado = np.zeros_like(x_vals)
-        for i, c in enumerate(coef):
-            phi_func = sp.lambdify(x, self.phi_base[i], 'numpy')
-            try:
-                resultado += c * phi_func(x_vals)
-            except:
-                pass
+    def funcional_carga(self, edp_params):
+        return self.x_col, np.eye(self.n_col)
 
-        return resultado, coef
+    def projetar(self, cargas, B):
+        if self.modo == 'chebyshev':
+            return super().projetar(cargas, B)
+        # Senos nos pontos equiespaçados: B é a matriz da DST-I e a inversa é a própria
+        # transformada (O(n log n), sem fatorar B)
+        cargas = np.asarray(cargas, dtype=float)
+        valores = np.zeros((self.n_col + 2,) + cargas.shape[1:])
+        valores[1:-1] = cargas
+        return np.moveaxis(nos_para_senos(np.moveaxis(valores, 0, -1)), -1, 0)
@@ -1,8 +1,565 @@
+import warnings
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
+import sympy as sp
+from scipy import sparse
+from scipy.linalg import cho_factor, cho_solve, eig, eigh, lu_factor, lu_solve, solve_triangular
+from scipy.linalg.lapack import dgecon
+from scipy.sparse.linalg import eigs, eigsh, splu
+from .perfil import PerfilExecucao, fase
+
+# Cache compartilhado de derivação e compilação (lambdify) de expressões em x.
+# Cada expressão distinta é derivada/compilada uma única vez por processo.
+# Símbolos além de x são parâmetros livres (ex.: k em r = k**2): a expressão é
+# compilada como função de (x, parâmetros) e avaliada com os valores atuais de
+# parametros(...), então varrer os valores não refaz nenhum trabalho simbólico.
+TAMANHO_CACHE = 1024
+x = sp.Symbol('x')
+_valores_parametros = {}
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _derivar(expr, ordem):
+    return sp.diff(expr, x, ordem)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _compilar(expr):
+    livres = tuple(sorted(expr.free_symbols - {x}, key=str))
+    func = sp.lambdify((x,) + livres, expr, 'numpy')
+
+    def avaliar(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        valores = np.array(func(x_vals, *valores_parametros(livres)), dtype=float)
+        if valores.shape != x_vals.shape:
+            valores = np.full(x_vals.shape, valores)
+        return valores
+    return avaliar
+
+
+def derivar(expr, ordem=1):
+    with fase('simbolico'):
+        return _derivar(sp.sympify(expr), ordem)
+
+
+def parametros_livres(expr):
+    # Nomes dos símbolos de expr além de x, em ordem alfabética
+    return tuple(sorted(str(s) for s in sp.sympify(expr).free_symbols - {x}))
+
+
+def valores_parametros(simbolos):
+    try:
+        return tuple(_valores_parametros[str(s)] for s in simbolos)
+    except KeyError as e:
+        raise ValueError(f"Parâmetro livre {e.args[0]!r} sem valor: use parametros({e.args[0]}=...).") from None
+
+
+@contextmanager
+def parametros(**valores):
+    # Valores dos parâmetros livres dentro do bloco (aninháveis)
+    anteriores = dict(_valores_parametros)
+    _valores_parametros.update({nome: float(valor) for nome, valor in valores.items()})
+    try:
+        yield
+    finally:
+        _valores_parametros.clear()
+        _valores_parametros.update(anteriores)
+
+
+def compilar(expr, ordem=0):
+    # Devolve uma função vetorizada x_vals -> array com a derivada `ordem` de expr
+    with fase('simbolico'):
+        expr = sp.sympify(expr)
+        if ordem:
+            expr = _derivar(expr, ordem)
+    with fase('compilacao'):
+        return _compilar(expr)
+
+
+def estatisticas_cache():
+    estatisticas = {}
+    for nome, funcao in (('derivacao', _derivar), ('compilacao', _compilar)):
+        info = funcao.cache_info()
+        estatisticas[nome] = {'acertos': info.hits, 'falhas': info.misses,
+                              'tamanho': info.currsize, 'capacidade': info.maxsize}
+    return estatisticas
+
+
+def limpar_cache():
+    _derivar.cache_clear()
+    _compilar.cache_clear()
+
+
+def coeficientes_constantes(edp_params):
+    # (p, q, r) como floats quando nenhum coeficiente depende de x; None caso contrário
+    # (parâmetros livres entram com os valores atuais de parametros(...))
+    valores = []
+    for nome in ('p', 'q', 'r'):
+        coef = sp.sympify(edp_params[nome])
+        if x in coef.free_symbols:
+            return None
+        valores.append(float(coef) if coef.is_number else float(compilar(coef)(0.0)))
+    return tuple(valores)
+
+
+# Abaixo deste inverso do nº de condição a LU pode não ter nenhum dígito confiável
+RCOND_MINIMO = np.finfo(float).eps
+
+
+def _singular(motivo):
+    warnings.warn(f"Matriz do sistema {motivo}: os coeficientes serão nulos. "
+                  f"Reduza o nº de funções base ou use uma base ortogonal.")
+    return ('singular', None)
+
+
+def _mal_condicionada(rcond, contexto=""):
+    # A estimativa do condicionamento não é um teste de singularidade: só avisa e a
+    # solução da LU continua sendo usada
+    warnings.warn(f"Matriz do sistema numericamente singular (1/cond ≈ {rcond:.1e}{contexto}): "
+                  f"a solução pode não ter dígitos confiáveis. "
+                  f"Reduza o nº de funções base ou use uma base ortogonal.")
+
+
+def fatorar_matriz(A):
+    # Fatoração reutilizável de A: diagonal, Cholesky (simétrica positiva definida) ou LU;
+    # matrizes do scipy.sparse (ex.: elementos finitos) usam a LU esparsa (SuperLU).
+    # Só uma fatoração que falha (pivô exatamente nulo) dá coeficientes nulos; matrizes
+    # mal condicionadas geram um aviso e seguem com a LU.
+    if sparse.issparse(A):
+        try:
+            # Ordem natural: em matrizes de banda não há preenchimento fora da banda
+            return ('esparsa', splu(sparse.csc_matrix(A), permc_spec='NATURAL'))
+        except RuntimeError:
+            return _singular("singular")
+    diagonal = np.diag(A).copy()
+    if np.count_nonzero(A) == np.count_nonzero(diagonal):
+        if np.all(diagonal != 0):
+            return ('diagonal', diagonal)
+        return _singular("singular")
+    if np.allclose(A, A.T):
+        try:
+            return ('cholesky', cho_factor(A))
+        except np.linalg.LinAlgError:
+            pass
+    try:
+        lu, piv = lu_factor(A, check_finite=False)
+    except np.linalg.LinAlgError:
+        return _singular("singular")
+    if np.any(np.diag(lu) == 0):
+        return _singular("singular")
+    # Estimativa do condicionamento (LAPACK gecon) a partir da LU: O(n²)
+    rcond, _ = dgecon(lu, np.abs(A).sum(axis=0).max(), norm='1')
+    if not rcond > RCOND_MINIMO:
+        _mal_condicionada(rcond)
+    return ('lu', (lu, piv))
+
+
+def _amostrar_cargas(cargas, x_vals):
+    # (n_cargas, len(x_vals)): função vetorizada F(x) ou sequência de expressões
+    if callable(cargas) and not isinstance(cargas, sp.Basic):
+        F = np.asarray(cargas(x_vals), dtype=float)
+        return F.reshape(-1, len(x_vals))
+    cargas = list(np.ravel(np.asarray(cargas, dtype=object)))
+    F = np.empty((len(cargas), len(x_vals)))
+    for i, g in enumerate(cargas):
+        F[i] = compilar(g)(x_vals)
+    return F
+
+
+def resolver_fatoracao(fatoracao, b_vec):
+    tipo, fator = fatoracao
+    if tipo == 'diagonal':
+        return b_vec / fator.reshape((-1,) + (1,) * (np.ndim(b_vec) - 1))
+    if tipo == 'cholesky':
+        return cho_solve(fator, b_vec)
+    if tipo == 'lu':
+        return lu_solve(fator, b_vec)
+    if tipo == 'esparsa':
+        return fator.solve(np.asarray(b_vec, dtype=float))
+    # Sistema singular: mantém o comportamento histórico de coeficientes nulos
+    return np.zeros_like(b_vec, dtype=float)
+
+
+# Acima deste nº de funções base os autopares vêm do eigsh/eigs com shift-invert
+N_AUTOVALORES_DENSO = 500
+
+
+def _simetrica(A):
+    if sparse.issparse(A):
+        escala = abs(A).max()
+        return escala == 0 or abs(A - A.T).max() <= 1e-12 * escala
+    return np.allclose(A, A.T)
+
+
+def autopares(K, M, n_modos, sigma=0.0, esparso=None):
+    # n_modos autopares de K c = λ M c com λ mais próximo de sigma, em ordem de
+    # |λ - sigma|: eigh/eig com as matrizes densas ou eigsh/eigs em modo shift-invert
+    # (só fatora K - sigma M). K não simétrica (convecção) usa eig/eigs e os
+    # autovalores podem ser complexos. Devolve (autovalores, vetores (n_base, n_modos)).
+    n = K.shape[0]
+    n_modos = min(n_modos, n)
+    simetrica = _simetrica(K) and _simetrica(M)
+    if esparso is None:
+        esparso = sparse.issparse(K) or n > N_AUTOVALORES_DENSO
+    if esparso and n_modos < n - 1:
+        if simetrica:
+            autovalores, vetores = eigsh(K, n_modos, M, sigma=sigma, which='LM')
+        else:
+            autovalores, vetores = eigs(K, n_modos, M, sigma=sigma, which='LM')
+    else:
+        K, M = (A.toarray() if sparse.issparse(A) else np.asarray(A) for A in (K, M))
+        if simetrica:
+            autovalores, vetores = eigh(K, M)
+        else:
+            autovalores, vetores = eig(K, M)
+    ordem = np.argsort(np.abs(autovalores - sigma), kind='stable')[:n_modos]
+    autovalores, vetores = autovalores[ordem], vetores[:, ordem]
+    if np.iscomplexobj(autovalores) and np.allclose(autovalores.imag, 0, atol=1e-10 * np.max(np.abs(autovalores))):
+        autovalores, vetores = autovalores.real, vetores.real
+    return autovalores, vetores
+
+
+class FatoracaoBordeada:
+    # LU por blocos que cresce junto com a matriz (bases hierárquicas): P A = L U com
+    # P bloco-diagonal. Ao ampliar de n para m só o complemento de Schur da borda,
+    # S = A22 - L21 U12, é fatorado: O(n²(m - n)) em vez de O(m³). O bloco principal
+    # n x n de L e U é a fatoração de A[:n, :n], então qualquer tamanho já ampliado
+    # pode ser resolvido.
+    # O pivoteamento só acontece dentro de cada bloco novo (nunca troca uma linha da
+    # borda com uma linha já fatorada), então o crescimento dos fatores não é
+    # controlado entre blocos: a cada ampliação o condicionamento de A[:m, :m] é
+    # estimado (dgecon, O(m²)) e, como em fatorar_matriz, a matriz mal condicionada
+    # gera um aviso (uma vez) e a solução segue; só um pivô nulo dá coeficientes nulos.
+    def __init__(self, n_maximo):
+        self.L = np.zeros((n_maximo, n_maximo))
+        self.U = np.zeros((n_maximo, n_maximo))
+        self.perm = np.arange(n_maximo)
+        self.n = 0
+        self.singular_em = None
+        self.mal_condicionada_em = None
+
+    def ampliar(self, A):
+        # A: matriz m x m cujo bloco principal n x n é a matriz já fatorada
+        m, n = A.shape[0], self.n
+        if m <= n:
+            return self
+        p = self.perm[:n]
+        U12 = solve_triangular(self.L[:n, :n], A[p, n:m], lower=True, unit_diagonal=True)
+        L21 = solve_triangular(self.U[:n, :n], A[n:m, :n].T, trans='T').T
+        lu, piv = lu_factor(A[n:m, n:m] - L21 @ U12, check_finite=False)
+        perm = np.arange(m - n)
+        for i, j in enumerate(piv):
+            perm[i], perm[j] = perm[j], perm[i]
+        self.perm[n:m] = n + perm
+        self.L[n:m, :n] = L21[perm]
+        self.L[n:m, n:m] = np.tril(lu, -1) + np.eye(m - n)
+        self.U[:n, n:m] = U12
+        self.U[n:m, n:m] = np.triu(lu)
+        self.n = m
+        if self.singular_em is not None:
+            return self
+        if np.any(np.diag(lu) == 0):
+            _singular(f"singular com {m} funções base")
+            self.singular_em = m
+        elif self.mal_condicionada_em is None:
+            fatores = np.tril(self.L[:m, :m], -1) + self.U[:m, :m]
+            rcond, _ = dgecon(fatores, np.abs(A[:m, :m]).sum(axis=0).max(), norm='1')
+            if not rcond > RCOND_MINIMO:
+                _mal_condicionada(rcond, f" com {m} funções base")
+                self.mal_condicionada_em = m
+        return self
+
+    def resolver(self, b_vec, n=None):
+        n = self.n if n is None else n
+        if self.singular_em is not None and n >= self.singular_em:
+            # Já avisado em ampliar()
+            return resolver_fatoracao(('singular', None), b_vec)
+        y = solve_triangular(self.L[:n, :n], np.asarray(b_vec)[self.perm[:n]], lower=True,
+                             unit_diagonal=True)
+        return solve_triangular(self.U[:n, :n], y)
+
+
 class EDPSolver:
-    def __init__(self, dominio, n_pontos, condicoes_contorno):
+    def __init__(self, dominio, n_pontos, condicoes_contorno, n_quad=None, verificar_quad=False,
+                 n_base=None):
         self.dominio = dominio
         self.n_pontos = n_pontos
         self.condicoes_contorno = condicoes_contorno
+        # Tamanho da base independente da malha de saída (None = n_pontos - 2)
+        self.n_base = n_base or max(3, n_pontos - 2)
+        self.x = np.linspace(dominio[0], dominio[1], n_pontos)
+        # Nº de nós de Gauss-Legendre (None = automático) e checagem opcional contra scipy quad
+        self.n_quad = n_quad
+        self.verificar_quad = verificar_quad
+        self.desvio_quad = None
+        # Operador montado/fatorado da última resolução e os p, q, r de origem:
+        # resolver() com os mesmos coeficientes e resolver_f() os reaproveitam
+        self._operador_montado = None
+        self._fatoracao = None
+        self._coeficientes = None
+        self._edp_params = None
+        self._funcional = None
+        # Bases amostradas nos nós da quadratura: as montagens seguintes (outros
+        # p, q, r ou valores de parâmetros) só reamostram os coeficientes
+        self._amostras_quadratura = {}
+
+    def __getstate__(self):
+        # A LU esparsa (SuperLU) não é serializável: é refeita a partir do operador;
+        # as bases amostradas são refeitas na próxima montagem
+        estado = dict(self.__dict__)
+        estado['_amostras_quadratura'] = {}
+        if estado['_fatoracao'] is not None and estado['_fatoracao'][0] == 'esparsa':
+            estado['_fatoracao'] = None
+        return estado
 
     def resolver(self, edp_params):
-        raise NotImplementedError("O método resolver deve ser implementado nas subclasses.")
\ No newline at end of file
+        if not isinstance(edp_params['f'], sp.Basic):
+            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
+        fatoracao = self.fatorar(edp_params)
+        with fase('montagem'):
+            b_vec = self.montar_carga(edp_params)
+        with fase('solucao'):
+            coef = resolver_fatoracao(fatoracao, b_vec)
+        return self.reconstruir(coef), coef
+
+    def resolver_com_perfil(self, edp_params):
+        # Como resolver(), mas devolve também o PerfilExecucao com o tempo de cada fase
+        with PerfilExecucao(type(self).__name__) as perfil:
+            resultado, coef = self.resolver(edp_params)
+        return resultado, coef, perfil
+
+    # Fases separadas: o operador depende só de p, q, r e pode ser fatorado uma
+    # vez e reaproveitado para várias cargas (ex.: passos de tempo). Com o cache em
+    # disco ativo (cache_disco.py), operador e fatoração vêm de lá quando possível.
+    def fatorar(self, edp_params):
+        coeficientes = tuple(sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        # Com parâmetros livres, o operador vale só para os valores atuais deles,
+        # e sempre só para as bases atuais (ex.: funcoes_base trocadas)
+        livres = sorted(set().union(*(parametros_livres(c) for c in coeficientes)))
+        coeficientes += valores_parametros(livres)
+        coeficientes += (self._base_teste().chave(), self._base_tentativa().chave())
+        if self._operador_montado is None or coeficientes != self._coeficientes:
+            self._operador_montado, self._fatoracao = self._operador_fatorado(edp_params)
+            self._coeficientes = coeficientes
+            self._edp_params = edp_params
+            self._funcional = None
+        return self._fatoracao_atual()
+
+    def _fatoracao_atual(self):
+        if self._fatoracao is None and self._operador_montado is not None:
+            with fase('solucao'):
+                self._fatoracao = fatorar_matriz(self._operador_montado)
+        return self._fatoracao
+
+    def resolver_f(self, f):
+        # Só a carga muda: integra f com o funcional de carga (guardado) e reaproveita
+        # o operador fatorado na última resolução (resolver() ou fatorar()).
+        # f: expressão do SymPy, ou uma família de cargas resolvida em lote (ver
+        # resolver_lote): lista/array de expressões ou função vetorizada F(x) que
+        # devolve (n_cargas, len(x)). Em lote devolve arrays 2-D, uma carga por linha.
+        if self._operador_montado is None:
+            raise RuntimeError("Chame resolver() ou fatorar() antes de resolver_f().")
+        if self._funcional is None:
+            self._funcional = self.funcional_carga(self._edp_params)
+        x_amostras, W = self._funcional
+        with fase('montagem'):
+            if isinstance(f, sp.Basic):
+                B = W @ compilar(f)(x_amostras)
+            else:
+                # Todas as cargas amostradas nos mesmos pontos: B = W Fᵀ (n_base, n_cargas)
+                B = W @ _amostrar_cargas(f, x_amostras).T
+        with fase('solucao'):
+            coef = resolver_fatoracao(self._fatoracao_atual(), B)
+        coef = coef if coef.ndim == 1 else np.ascontiguousarray(coef.T)
+        return self.reconstruir(coef), coef
+
+    def resolver_lote(self, edp_params, cargas):
+        # Mesmo operador (p, q, r de edp_params) para uma família de cargas: uma
+        # fatoração, um produto W Fᵀ e uma única resolução com várias colunas.
+        # Devolve (solucoes, coef) com formas (n_cargas, n_pontos) e (n_cargas, n_base).
+        self.fatorar(edp_params)
+        return self.resolver_f(cargas)
+
+    def operador(self, edp_params):
+        # Matriz do sistema (montada uma vez por p, q, r; do cache em disco quando ativo)
+        self.fatorar(edp_params)
+        return self._operador_montado
+
+    def _operador_fatorado(self, edp_params):
+        from .cache_disco import cache_ativo, chave_operador
+        cache = cache_ativo()
+        if cache is not None:
+            with fase('montagem'):
+                chave = chave_operador(self, edp_params)
+                entrada = cache.carregar(chave)
+            if entrada is not None:
+                return entrada
+        with fase('montagem'):
+            A = self.montar_operador(edp_params)
+        with fase('solucao'):
+            fatoracao = fatorar_matriz(A)
+        if cache is not None:
+            cache.gravar(chave, A, fatoracao)
+        return A, fatoracao
+
+    def resolver_fatorado(self, b_vec):
+        if self._operador_montado is None:
+            raise RuntimeError("Chame fatorar() antes de resolver_fatorado().")
+        fatoracao = self._fatoracao_atual()
+        with fase('solucao'):
+            return resolver_fatoracao(fatoracao, b_vec)
+
+    def montar_operador(self, edp_params):
+        from .quadratura import montar_operador
+        A = self._matriz_exata(edp_params)
+        if A is None:
+            with fase('simbolico'):
+                termos = self._termos_matriz(edp_params)
+            A, desvio = montar_operador(
+                self.dominio, self._base_teste(), self._base_tentativa(),
+                termos, n_nos=self.n_quad, verificar=self.verificar_quad,
+                amostras=self._amostras_quadratura)
+            self.desvio_quad = desvio
+        return A
+
+    def montar_carga(self, edp_params):
+        from .quadratura import montar_carga
+        with fase('simbolico'):
+            termos = self._termos_carga(edp_params)
+        b_vec, desvio = montar_carga(self.dominio, self._base_teste(), termos,
+                                     n_nos=self.n_quad, verificar=self.verificar_quad)
+        if desvio is not None:
+            self.desvio_quad = max(desvio, self.desvio_quad or 0.0)
+        return b_vec
+
+    def funcional_carga(self, edp_params):
+        # (x_amostras, W) tais que a carga de qualquer g é W @ g(x_amostras);
+        # permite montar cargas sem nenhum trabalho simbólico.
+        from .quadratura import QuadraturaGaussLegendre, n_nos_padrao
+        a, b = self.dominio
+        base_teste = self._base_teste()
+        with fase('montagem'):
+            quad_gl = QuadraturaGaussLegendre(a, b, self.n_quad or n_nos_padrao(base_teste.n_base))
+            W = np.zeros((base_teste.n_base, quad_gl.n_nos))
+            for c, ordem in self._termos_teste(edp_params):
+                c = sp.sympify(c)
+                if not c.is_zero:
+                    W += base_teste(quad_gl.x, ordem) * (compilar(c)(quad_gl.x) * quad_gl.w)
+        return quad_gl.x, W
+
+    def matriz_carga(self, edp_params):
+        # B[i, j] = carga da função base φj: a carga de u = Σ c_j φj é B @ c
+        x_amostras, W = self.funcional_carga(edp_params)
+        with fase('montagem'):
+            return W @ self._base_tentativa()(x_amostras).T
+
+    def projetar(self, cargas, B):
+        # Coeficientes c com B c = cargas, B = matriz_carga(...): a função cuja carga
+        # (pelas funções teste do método) é `cargas` escrita na base de tentativa
+        # (condições iniciais dos passos de tempo). cargas pode ter uma coluna por função.
+        return resolver_fatoracao(fatorar_matriz(B), cargas)
+
+    def reconstruir(self, coef, x_vals=None):
+        # u_h(x) = Σ c_i φ_i(x) avaliada de uma vez pela base numérica (a base de
+        # senos usa a DST na malha de saída; coef pode ser 2-D, um vetor por linha)
+        if x_vals is None:
+            x_vals = self.x
+        with fase('avaliacao'):
+            return self._base_tentativa().combinar(coef, x_vals)
+
+    # Montagem vetorizada para os métodos integrais: as subclasses informam as
+    # bases de teste/tentativa e os termos das formas integrais.
+    def _base_tentativa(self):
+        raise NotImplementedError("A base de tentativa deve ser definida nas subclasses.")
+
+    def _base_teste(self):
+        return self._base_tentativa()
+
+    def _termos_matriz(self, edp_params):
+        raise NotImplementedError("Os termos da matriz devem ser definidos nas subclasses.")
+
+    def _termos_teste(self, edp_params):
+        # Carga = Σ ∫ f c(x) ψ_i^(ordem) dx para (c, ordem) nesta lista
+        return [(1, 0)]
+
+    def _termos_carga(self, edp_params):
+        return [(edp_params['f'] * c, ordem) for c, ordem in self._termos_teste(edp_params)]
+
+    def _matriz_exata(self, edp_params):
+        # Subclasses podem devolver a matriz em forma fechada (sem integração)
+        return None
+
+    def _forma_simetrica(self):
+        # True quando teste = tentativa (Ritz-Galerkin): K c = λ M c, com a matriz de
+        # massa M = ∫ peso φi φj, discretiza o problema de autovalores L u = λ peso u
+        return False
+
+    def modos_proprios(self, edp_params, n_modos=6, peso=1, sigma=0.0, esparso=None):
+        # Autovalores de L u = λ peso u (L com os p, q, r de edp_params e a convenção
+        # de sinais do método) mais próximos de sigma e as formas modais na malha de
+        # saída: (autovalores, modos (n_modos, n_pontos), coeficientes (n_modos, n_base)).
+        # Uma resolução substitui a varredura de r procurando ressonâncias.
+        if not self._forma_simetrica():
+            raise NotImplementedError(f"{type(self).__name__} não tem a forma de Ritz-Galerkin "
+                                      f"(teste = tentativa) exigida por modos_proprios().")
+        with fase('montagem'):
+            K = self.montar_operador(edp_params)
+            M = self.montar_operador({'p': 0, 'q': 0, 'r': peso})
+        with fase('solucao'):
+            autovalores, vetores = autopares(K, M, n_modos, sigma, esparso)
+        coef = np.ascontiguousarray(vetores.T)
+        modos = self.reconstruir(coef)
+        # Sinal determinístico: o maior valor absoluto de cada modo é positivo
+        sinais = np.sign(np.take_along_axis(modos, np.argmax(np.abs(modos), axis=1)[:, None], axis=1))
+        sinais[sinais == 0] = 1
+        return autovalores, modos * sinais, coef * sinais
+
+    def _sinal_difusao(self):
+        # Sinal do termo de 2ª ordem da forma forte do método: p u'' (padrão) ou -(p u')'
+        return 1
+
+    def operador_difusao(self, difusividade, reacao):
+        # edp_params de -difusividade u'' + reacao u na convenção de sinais do método
+        # (operadores dos passos implícitos de calor e onda)
+        return {'p': -self._sinal_difusao() * difusividade, 'q': 0, 'r': reacao}
+
+    def _base_hierarquica(self):
+        # True quando as n primeiras funções da base de tamanho m formam a base de
+        # tamanho n (senos, monômios, polinômios): permite a montagem por bordas
+        return False
+
+    def montagem_incremental(self, edp_params):
+        # MontagemIncremental até self.n_base funções (None se a base não é hierárquica)
+        from .quadratura import MontagemIncremental, QuadraturaGaussLegendre, n_nos_padrao
+        if not self._base_hierarquica():
+            return None
+        with fase('montagem'):
+            A = self._matriz_exata(edp_params)
+            if A is not None:
+                return MontagemIncremental.pronta(A)
+            with fase('simbolico'):
+                termos = self._termos_matriz(edp_params)
+            a, b = self.dominio
+            quad_gl = QuadraturaGaussLegendre(a, b, self.n_quad or n_nos_padrao(self.n_base))
+            return MontagemIncremental(quad_gl, self._base_teste(), self._base_tentativa(), termos)
+
+    def _termos_residuo(self, edp_params):
+        # Forma forte da equação que o método resolve: Σ c u^(ordem) = f.
+        # None quando a base não tem as derivadas necessárias (ex.: elementos lineares)
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        return [(p, 2), (q, 1), (r, 0)]
+
+    def residuo(self, edp_params, coef, x_vals):
+        # Resíduo L u_h - f nos pontos x_vals (None sem forma forte avaliável)
+        termos = self._termos_residuo(edp_params)
+        if termos is None:
+            return None
+        base = self._base_tentativa()
+        with fase('avaliacao'):
+            valores = -compilar(edp_params['f'])(x_vals)
+            for c, ordem in termos:
+                c = sp.sympify(c)
+                if not c.is_zero:
+                    valores = valores + compilar(c)(x_vals) * base.combinar(coef, x_vals, ordem)
+        return valores
@@ -0,0 +1,110 @@
+import numpy as np
+import sympy as sp
+from scipy import sparse
+from .edp_solver_base import EDPSolver, compilar
+from .bases import BaseLagrange
+from .perfil import fase
+from .quadratura import QuadraturaGaussLegendre
+
+
+class MetodoElementosFinitos(EDPSolver):
+    # Elementos finitos de Lagrange (grau 1 ou 2) com a forma fraca do Rayleigh-Ritz:
+    #   ∫ (p φi' φj' + q φi' φj + r φi φj) dx = ∫ f φi dx
+    # A montagem é feita elemento a elemento de forma vetorizada (todos os elementos
+    # de uma vez) numa matriz do scipy.sparse; fatorar_matriz usa então a LU esparsa,
+    # que para a matriz de banda custa O(n). Por padrão os vértices da malha
+    # coincidem com os pontos de saída (n_elementos = n_pontos - 1); n_base pede
+    # (pelo menos) esse nº de nós interiores.
+    def __init__(self, dominio, n_pontos, condicoes_contorno, grau=1, n_elementos=None,
+                 n_quad=None, n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno, n_quad)
+        self.grau = grau
+        if n_elementos is None and n_base:
+            n_elementos = -(-(n_base + 1) // grau)
+        self.n_elementos = n_elementos or max(1, n_pontos - 1)
+        self.base = BaseLagrange(dominio, self.n_elementos, grau)
+        self.n_base = self.base.n_base
+
+    def _base_tentativa(self):
+        return self.base
+
+    def _termos_matriz(self, edp_params):
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        return [(p, 1, 1), (q, 1, 0), (r, 0, 0)]
+
+    def _forma_simetrica(self):
+        return True
+
+    def _sinal_difusao(self):
+        # Forma forte -(p u')' + ...
+        return -1
+
+    def _termos_residuo(self, edp_params):
+        # u_h é só C⁰: o resíduo forte ignoraria os saltos de p u' entre elementos
+        return None
+
+    def _quadratura(self):
+        # Pontos de Gauss de todos os elementos (n_elementos, n_gauss), pesos e
+        # coordenadas no elemento de referência; n_quad = pontos por elemento
+        referencia = QuadraturaGaussLegendre(-1.0, 1.0, self.n_quad or self.grau + 2)
+        h = self.base.h
+        centros = self.dominio[0] + h * (np.arange(self.n_elementos) + 0.5)
+        x_q = centros[:, None] + 0.5 * h * referencia.x[None, :]
+        return x_q, 0.5 * h * referencia.w, referencia.x
+
+    def _matriz_global(self, termos):
+        # Σ ∫ c ψ_i^(ordem_teste) φ_j^(ordem_tentativa) restrita aos nós interiores
+        x_q, w, xi = self._quadratura()
+        n_local = self.grau + 1
+        locais = np.zeros((self.n_elementos, n_local, n_local))
+        for coef, ordem_i, ordem_j in termos:
+            coef = sp.sympify(coef)
+            if coef.is_zero:
+                continue
+            locais += np.einsum('eg,ag,bg->eab', compilar(coef)(x_q) * w,
+                                self.base.forma(xi, ordem_i), self.base.forma(xi, ordem_j))
+        conectividade = self.base.conectividade
+        linhas = np.repeat(conectividade, n_local, axis=1).ravel()
+        colunas = np.tile(conectividade, (1, n_local)).ravel()
+        A = sparse.csr_matrix((locais.ravel(), (linhas, colunas)),
+                              shape=(self.base.n_nos, self.base.n_nos))
+        return A[1:-1, 1:-1]
+
+    def montar_operador(self, edp_params):
+        with fase('simbolico'):
+            termos = self._termos_matriz(edp_params)
+        return self._matriz_global(termos)
+
+    def montar_carga(self, edp_params):
+        x_q, w, xi = self._quadratura()
+        with fase('simbolico'):
+            termos = self._termos_carga(edp_params)
+        locais = np.zeros((self.n_elementos, self.grau + 1))
+        for g, ordem in termos:
+            g = sp.sympify(g)
+            if not g.is_zero:
+                locais += np.einsum('eg,ag->ea', compilar(g)(x_q) * w, self.base.forma(xi, ordem))
+        b_vec = np.bincount(self.base.conectividade.ravel(), weights=locais.ravel(),
+                            minlength=self.base.n_nos)
+        return b_vec[1:-1]
+
+    def funcional_carga(self, edp_params):
+        # W esparsa: cada ponto de Gauss só contribui para os nós do seu elemento
+        x_q, w, xi = self._quadratura()
+        with fase('montagem'):
+            n_local = self.grau + 1
+            pesos = np.zeros((self.n_elementos, n_local, x_q.shape[1]))
+            for c, ordem in self._termos_teste(edp_params):
+                c = sp.sympify(c)
+                if not c.is_zero:
+                    pesos += (compilar(c)(x_q) * w)[:, None, :] * self.base.forma(xi, ordem)[None]
+            linhas = np.repeat(self.base.conectividade[:, :, None], x_q.shape[1], axis=2)
+            colunas = np.broadcast_to(np.arange(x_q.size).reshape(self.n_elementos, 1, -1), pesos.shape)
+            W = sparse.csr_matrix((pesos.ravel(), (linhas.ravel(), colunas.ravel())),
+                                  shape=(self.base.n_nos, x_q.size))
+        return x_q.ravel(), W[1:-1]
+
+    def matriz_carga(self, edp_params):
+        # Matriz de massa (esparsa) com as funções teste do método
+        with fase('montagem'):
+            return self._matriz_global([(c, ordem, 0) for c, ordem in self._termos_teste(edp_params)])
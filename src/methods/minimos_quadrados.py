@@ -1,66 +1,51 @@
-from .edp_solver_base import EDPSolver
+from .edp_solver_base import EDPSolver, coeficientes_constantes
+from .bases import (BaseSenos, BasePolinomial, FAMILIAS_POLINOMIAIS, matrizes_senos,
+                    matriz_conveccao_senos)
 import numpy as np
 import sympy as sp
-from scipy.integrate import quad
-from numpy.linalg import solve
 
+BASES_MINIMOS_QUADRADOS = ('senos',) + FAMILIAS_POLINOMIAIS
 
-class MetodoMinimosQuadrados(EDPSolver):
-    def resolver(self, edp_params):
-        x = sp.Symbol('x')
-        if not isinstance(edp_params['f'], sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
-
-        a, b = self.dominio
-
-        n_base = max(3, self.n_pontos - 2)
-        phi_base = []
-        for i in range(1, n_base + 1):
-            phi = sp.sin(i * sp.pi * (x - a) / (b - a))
-            phi_base.append(phi)
-
-        A = np.zeros((n_base, n_base))
-        b_vec = np.zeros(n_base)
-
-        for i in range(n_base):
-            for j in range(n_base):
-                phi_j = phi_base[j]
-                Lu_j = (edp_params['p'] * sp.diff(phi_j, x, 2) +
-                        edp_params['q'] * sp.diff(phi_j, x) +
-                        edp_params['r'] * phi_j)
-
-                integrand = Lu_j * (edp_params['p'] * sp.diff(phi_base[i], x, 2) +
-                                    edp_params['q'] * sp.diff(phi_base[i], x) +
-                                    edp_params['r'] * phi_base[i])
 
-                func = sp.lambdify(x, integrand, 'numpy')
-                try:
-                    A[i, j], _ = quad(func, a, b)
-                except:
-                    A[i, j] = 0
-
-            integrand_rhs = edp_params['f'] * (edp_params['p'] * sp.diff(phi_base[i], x, 2) +
-                                               edp_params['q'] * sp.diff(phi_base[i], x) +
-                                               edp_params['r'] * phi_base[i])
-            func_rhs = sp.lambdify(x, integrand_rhs, 'numpy')
-            try:
-                b_vec[i], _ = quad(func_rhs, a, b)
-            except:
-                b_vec[i] = 0
-
-        try:
-            coef = solve(A, b_vec)
-        except:
-            coef = np.zeros(n_base)
-
-        # Calcula a solução aproximada nos pontos do domínio
-        x_vals = np.linspace(a, b, self.n_pontos)
-        resultado = np.zeros_like(x_vals)
-        for i, c in enumerate(coef):
-            phi_func = sp.lambdify(x, phi_base[i], 'numpy')
-            try:
-                resultado += c * phi_func(x_vals)
-            except:
-                pass
-
-        return resultado, coef
+class MetodoMinimosQuadrados(EDPSolver):
+    # base='senos' (original) ou uma família de polinômios ortogonais nula nas extremidades
+    def __init__(self, dominio, n_pontos, condicoes_contorno, base='senos', n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno, n_base=n_base)
+        if base not in BASES_MINIMOS_QUADRADOS:
+            raise ValueError(f"Base desconhecida: {base}. Use uma de {BASES_MINIMOS_QUADRADOS}.")
+        self.familia_base = base
+
+    def _base_tentativa(self):
+        if self.familia_base == 'senos':
+            return BaseSenos(self.dominio, self.n_base)
+        return BasePolinomial(self.dominio, self.n_base, self.familia_base, contorno=True)
+
+    def _base_hierarquica(self):
+        return True
+
+    def _termos_matriz(self, edp_params):
+        # ∫ (L φi)(L φj) dx, com L φ = p φ'' + q φ' + r φ
+        operador = self._operador(edp_params)
+        return [(ci * cj, oi, oj) for ci, oi in operador for cj, oj in operador]
+
+    def _termos_teste(self, edp_params):
+        # ∫ f (L φi) dx
+        return self._operador(edp_params)
+
+    def _operador(self, edp_params):
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        return [(p, 2), (q, 1), (r, 0)]
+
+    def _matriz_exata(self, edp_params):
+        constantes = None if self.familia_base != 'senos' else coeficientes_constantes(edp_params)
+        if constantes is None:
+            return None
+        p, q, r = constantes
+        massa, rigidez = matrizes_senos(self.dominio, self.n_base)
+        # L φi = d_i φi + q φi', com d_i = r - p k_i²
+        d = r - p * rigidez / massa
+        A = np.diag(d * d * massa + q**2 * rigidez)
+        if q != 0:
+            C = matriz_conveccao_senos(self.n_base)
+            A += q * (d[:, None] * C.T + C * d[None, :])
+        return A
@@ -1,61 +1,29 @@
 from .edp_solver_base import EDPSolver
-import numpy as np
+from .bases import BaseMonomios, BasePolinomial, FAMILIAS_POLINOMIAIS
 import sympy as sp
-from scipy.integrate import quad
-from numpy.linalg import solve
 
+BASES_MOMENTOS = ('monomios',) + FAMILIAS_POLINOMIAIS
 
-class MetodoMomentos(EDPSolver):
-    def resolver(self, edp_params):
-        x = sp.Symbol('x')
-        if not isinstance(edp_params['f'], sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
-
-        a, b = self.dominio
-
-        n_base = max(3, self.n_pontos - 2)
-        phi_base = []
-        for i in range(n_base):
-            phi = x**i  # Funções base polinomiais
-            phi_base.append(phi)
-
-        A = np.zeros((n_base, n_base))
-        b_vec = np.zeros(n_base)
-
-        for i in range(n_base):
-            for j in range(n_base):
-                phi_j = phi_base[j]
-                Lu_j = (edp_params['p'] * sp.diff(phi_j, x, 2) +
-                        edp_params['q'] * sp.diff(phi_j, x) +
-                        edp_params['r'] * phi_j)
 
-                integrand = phi_base[i] * Lu_j
-                func = sp.lambdify(x, integrand, 'numpy')
-                try:
-                    A[i, j], _ = quad(func, a, b)
-                except:
-                    A[i, j] = 0
-
-            integrand_rhs = phi_base[i] * edp_params['f']
-            func_rhs = sp.lambdify(x, integrand_rhs, 'numpy')
-            try:
-                b_vec[i], _ = quad(func_rhs, a, b)
-            except:
-                b_vec[i] = 0
-
-        try:
-            coef = solve(A, b_vec)
-        except:
-            coef = np.zeros(n_base)
-
-        # Calcula a solução aproximada nos pontos do domínio
-        x_vals = np.linspace(a, b, self.n_pontos)
-        resultado = np.zeros_like(x_vals)
-        for i, c in enumerate(coef):
-            phi_func = sp.lambdify(x, phi_base[i], 'numpy')
-            try:
-                resultado += c * phi_func(x_vals)
-            except:
-                pass
-
-        return resultado, coef
+class MetodoMomentos(EDPSolver):
+    # base='monomios' (original) ou uma família de polinômios ortogonais nula nas
+    # extremidades, com matriz bem condicionada mesmo para bases grandes
+    def __init__(self, dominio, n_pontos, condicoes_contorno, base='monomios', n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno, n_base=n_base)
+        if base not in BASES_MOMENTOS:
+            raise ValueError(f"Base desconhecida: {base}. Use uma de {BASES_MOMENTOS}.")
+        self.familia_base = base
+
+    def _base_tentativa(self):
+        if self.familia_base == 'monomios':
+            # Funções base polinomiais x**i
+            return BaseMonomios(self.n_base)
+        return BasePolinomial(self.dominio, self.n_base, self.familia_base, contorno=True)
+
+    def _base_hierarquica(self):
+        return True
+
+    def _termos_matriz(self, edp_params):
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        # ∫ φi (p φj'' + q φj' + r φj) dx
+        return [(p, 0, 2), (q, 0, 1), (r, 0, 0)]
@@ -0,0 +1,163 @@
+import time
+from contextvars import ContextVar
+
+# Instrumentação por fase dos solvers. Um PerfilExecucao ativo (usado como
+# gerenciador de contexto) acumula o tempo exclusivo de cada fase:
+#   simbolico   - sympify/derivação simbólica
+#   compilacao  - lambdify das expressões
+#   montagem    - quadratura/montagem das matrizes e cargas
+#   solucao     - fatoração e resolução dos sistemas lineares
+#   avaliacao   - reconstrução da solução na malha de saída
+# Fases aninhadas não são contadas duas vezes: o tempo da fase interna é
+# descontado da externa. Sem perfil ativo, fase() e passo() quase não custam nada.
+
+FASES = ('simbolico', 'compilacao', 'montagem', 'solucao', 'avaliacao')
+
+_perfil_ativo = ContextVar('perfil_ativo', default=None)
+_coletores = []
+
+
+def perfil_ativo():
+    return _perfil_ativo.get()
+
+
+def registrar_coletor(coletor):
+    # coletor(perfil) é chamado ao final de cada execução perfilada (ex.: envio a métricas)
+    if coletor not in _coletores:
+        _coletores.append(coletor)
+    return coletor
+
+
+def remover_coletor(coletor):
+    if coletor in _coletores:
+        _coletores.remove(coletor)
+
+
+def notificar_coletores(perfil):
+    for coletor in list(_coletores):
+        coletor(perfil)
+
+
+class _Fase:
+    __slots__ = ('nome', 'perfil', 'inicio', 'filhos')
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.perfil = None
+
+    def __enter__(self):
+        self.perfil = _perfil_ativo.get()
+        if self.perfil is not None:
+            self.filhos = 0.0
+            self.perfil._pilha.append(self)
+            self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.perfil is None:
+            return False
+        duracao = time.perf_counter() - self.inicio
+        pilha = self.perfil._pilha
+        pilha.pop()
+        if pilha:
+            pilha[-1].filhos += duracao
+        self.perfil._acumular(self.nome, duracao - self.filhos)
+        return False
+
+
+def fase(nome):
+    return _Fase(nome)
+
+
+class _Passo:
+    __slots__ = ('perfil', 'inicio')
+
+    def __enter__(self):
+        self.perfil = _perfil_ativo.get()
+        if self.perfil is not None:
+            self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.perfil is not None:
+            self.perfil.registrar_passo(time.perf_counter() - self.inicio)
+        return False
+
+
+def passo():
+    # Mede um passo de tempo (agregados em perfil.passos)
+    return _Passo()
+
+
+class PerfilExecucao:
+    def __init__(self, nome='', notificar=True):
+        self.nome = nome
+        self.notificar = notificar
+        self.fases = dict.fromkeys(FASES, 0.0)
+        self.chamadas = dict.fromkeys(FASES, 0)
+        self.passos = {'n': 0, 'total': 0.0, 'minimo': None, 'maximo': None}
+        self.total = 0.0
+        self._pilha = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _perfil_ativo.set(self)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total += time.perf_counter() - self._inicio
+        _perfil_ativo.reset(self._token)
+        self._token = None
+        if self.notificar:
+            notificar_coletores(self)
+        return False
+
+    def _acumular(self, nome, duracao):
+        self.fases[nome] = self.fases.get(nome, 0.0) + duracao
+        self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+
+    def registrar_passo(self, duracao):
+        passos = self.passos
+        passos['n'] += 1
+        passos['total'] += duracao
+        passos['minimo'] = duracao if passos['minimo'] is None else min(passos['minimo'], duracao)
+        passos['maximo'] = duracao if passos['maximo'] is None else max(passos['maximo'], duracao)
+
+    @property
+    def outros(self):
+        # Tempo fora das fases instrumentadas (ex.: construção dos objetos)
+        return max(0.0, self.total - sum(self.fases.values()))
+
+    @property
+    def media_passo(self):
+        return self.passos['total'] / self.passos['n'] if self.passos['n'] else 0.0
+
+    def resumo(self):
+        # Dicionário simples (picklable/JSON) com todas as medidas
+        return {'nome': self.nome, 'total': self.total, 'fases': dict(self.fases),
+                'chamadas': dict(self.chamadas), 'outros': self.outros,
+                'passos': dict(self.passos, media=self.media_passo)}
+
+    @classmethod
+    def de_resumo(cls, resumo):
+        perfil = cls(resumo['nome'], notificar=False)
+        perfil.total = resumo['total']
+        perfil.fases.update(resumo['fases'])
+        perfil.chamadas.update(resumo['chamadas'])
+        perfil.passos.update({k: v for k, v in resumo['passos'].items() if k != 'media'})
+        return perfil
+
+    def linhas(self):
+        linhas = [f"total {self.total * 1e3:.2f} ms"]
+        for nome, duracao in self.fases.items():
+            if self.chamadas.get(nome):
+                linhas.append(f"{nome}: {duracao * 1e3:.2f} ms ({self.chamadas[nome]} chamadas)")
+        linhas.append(f"outros: {self.outros * 1e3:.2f} ms")
+        if self.passos['n']:
+            linhas.append(f"passos: {self.passos['n']}, média {self.media_passo * 1e3:.3f} ms, "
+                          f"mín {self.passos['minimo'] * 1e3:.3f} ms, máx {self.passos['maximo'] * 1e3:.3f} ms")
+        return linhas
+
+    def __str__(self):
+        return f"{self.nome}: " + "; ".join(self.linhas())
@@ -0,0 +1,187 @@
+import warnings
+from functools import lru_cache
+import numpy as np
+import sympy as sp
+from scipy.integrate import quad
+from scipy.special import roots_legendre
+from .edp_solver_base import compilar
+
+# Motor de quadratura de Gauss-Legendre compartilhado pelos métodos integrais.
+# Coeficientes e funções base são amostrados uma única vez nos nós e as
+# matrizes inteiras são obtidas com produtos matriciais do NumPy.
+
+N_NOS_MIN = 64
+
+
+def n_nos_padrao(n_base):
+    # Nós suficientes para resolver os produtos das funções base de maior frequência
+    return max(N_NOS_MIN, 2 * n_base + 20)
+
+
+@lru_cache(maxsize=32)
+def _nos_pesos(n_nos):
+    # roots_legendre usa expansões assintóticas para n grande (leggauss é O(n³))
+    return roots_legendre(n_nos)
+
+
+class QuadraturaGaussLegendre:
+    def __init__(self, a, b, n_nos=N_NOS_MIN):
+        xi, wi = _nos_pesos(n_nos)
+        self.a = a
+        self.b = b
+        self.n_nos = n_nos
+        self.x = 0.5 * (b - a) * xi + 0.5 * (b + a)
+        self.w = 0.5 * (b - a) * wi
+
+    def matriz(self, U, V, peso=1.0):
+        # M[i, j] = ∫ peso(x) U_i(x) V_j(x) dx
+        return (U * (peso * self.w)) @ V.T
+
+    def vetor(self, U, g):
+        # v[i] = ∫ g(x) U_i(x) dx
+        return U @ (g * self.w)
+
+
+def amostrar(expr, x_vals):
+    return compilar(expr)(x_vals)
+
+
+# Os termos descrevem as formas integrais de cada método:
+#   matriz: [(c, ordem_teste, ordem_tentativa), ...] -> Σ ∫ c(x) ψ_i^(ordem_teste) φ_j^(ordem_tentativa) dx
+#   carga:  [(g, ordem_teste), ...]                  -> Σ ∫ g(x) ψ_i^(ordem_teste) dx
+
+def montar_matriz(quad_gl, base_teste, base_tentativa, termos, amostras=None):
+    # amostras: dicionário das bases amostradas nos nós, reaproveitado entre
+    # montagens com as mesmas bases (ex.: varredura de parâmetros); a chave de cada
+    # amostra inclui a base, então trocar a base nunca reaproveita amostras antigas
+    A = np.zeros((base_teste.n_base, base_tentativa.n_base))
+    if amostras is None:
+        amostras = {}
+    for coef, ordem_i, ordem_j in termos:
+        coef = sp.sympify(coef)
+        if coef.is_zero:
+            continue
+        teste = ('teste', base_teste.chave(), ordem_i, quad_gl.n_nos)
+        if teste not in amostras:
+            amostras[teste] = base_teste(quad_gl.x, ordem_i)
+        tentativa = ('tentativa', base_tentativa.chave(), ordem_j, quad_gl.n_nos)
+        if tentativa not in amostras:
+            amostras[tentativa] = base_tentativa(quad_gl.x, ordem_j)
+        A += quad_gl.matriz(amostras[teste], amostras[tentativa], amostrar(coef, quad_gl.x))
+    return A
+
+
+def montar_vetor(quad_gl, base_teste, termos):
+    b_vec = np.zeros(base_teste.n_base)
+    for g, ordem in termos:
+        g = sp.sympify(g)
+        if g.is_zero:
+            continue
+        b_vec += quad_gl.vetor(base_teste(quad_gl.x, ordem), amostrar(g, quad_gl.x))
+    return b_vec
+
+
+class MontagemIncremental:
+    # Montagem por bordas para bases hierárquicas (as n primeiras funções da base de
+    # tamanho m formam a base de tamanho n): ao passar de n para m funções só a borda
+    # A[n:m, :m] e A[:n, n:m] é integrada. Coeficientes e bases são amostrados uma
+    # única vez nos nós da quadratura do maior tamanho.
+    def __init__(self, quad_gl, base_teste, base_tentativa, termos):
+        self.n_maximo = min(base_teste.n_base, base_tentativa.n_base)
+        self.termos = []
+        for coef, ordem_i, ordem_j in termos:
+            coef = sp.sympify(coef)
+            if not coef.is_zero:
+                self.termos.append((amostrar(coef, quad_gl.x) * quad_gl.w, ordem_i, ordem_j))
+        self._teste = {oi: base_teste(quad_gl.x, oi) for _, oi, _ in self.termos}
+        self._tentativa = {oj: base_tentativa(quad_gl.x, oj) for _, _, oj in self.termos}
+        self.A = np.zeros((self.n_maximo, self.n_maximo))
+        self.n = 0
+
+    @classmethod
+    def pronta(cls, A):
+        # Matriz já conhecida (ex.: forma fechada): ampliar() só recorta os blocos
+        montagem = cls.__new__(cls)
+        montagem.n_maximo = A.shape[0]
+        montagem.termos = []
+        montagem.A = A
+        montagem.n = A.shape[0]
+        return montagem
+
+    def ampliar(self, m):
+        # Bloco principal m x m, integrando só o que ainda não foi montado
+        if m > self.n_maximo:
+            raise ValueError(f"A montagem incremental vai até {self.n_maximo} funções base.")
+        n = self.n
+        if m > n:
+            for peso, ordem_i, ordem_j in self.termos:
+                T, V = self._teste[ordem_i], self._tentativa[ordem_j]
+                self.A[n:m, :m] += (T[n:m] * peso) @ V[:m].T
+                self.A[:n, n:m] += (T[:n] * peso) @ V[n:m].T
+            self.n = m
+        return self.A[:m, :m]
+
+
+# Caminho de referência: uma integração adaptativa (scipy quad) por entrada
+
+def montar_matriz_quad(dominio, base_teste, base_tentativa, termos):
+    a, b = dominio
+    termos = [(compilar(c), oi, oj) for c, oi, oj in termos]
+    A = np.zeros((base_teste.n_base, base_tentativa.n_base))
+    for i in range(base_teste.n_base):
+        for j in range(base_tentativa.n_base):
+            def integrand(s):
+                s = np.array([s])
+                return sum(c(s)[0] * base_teste(s, oi)[i, 0] * base_tentativa(s, oj)[j, 0]
+                           for c, oi, oj in termos)
+            A[i, j], _ = quad(integrand, a, b, limit=200)
+    return A
+
+
+def montar_vetor_quad(dominio, base_teste, termos):
+    a, b = dominio
+    termos = [(compilar(g), o) for g, o in termos]
+    b_vec = np.zeros(base_teste.n_base)
+    for i in range(base_teste.n_base):
+        def integrand(s):
+            s = np.array([s])
+            return sum(g(s)[0] * base_teste(s, o)[i, 0] for g, o in termos)
+        b_vec[i], _ = quad(integrand, a, b, limit=200)
+    return b_vec
+
+
+def _desvio(valor, referencia, n_nos, tol):
+    desvio = np.max(np.abs(valor - referencia), initial=0.0)
+    escala = max(1.0, np.max(np.abs(referencia), initial=0.0))
+    if desvio > tol * escala:
+        warnings.warn(
+            f"Quadratura de Gauss-Legendre com {n_nos} nós difere da integração "
+            f"adaptativa (quad) em {desvio:.3e}; aumente n_quad.")
+    return desvio
+
+
+def montar_operador(dominio, base_teste, base_tentativa, termos_matriz,
+                    n_nos=None, verificar=False, tol=1e-8, amostras=None):
+    a, b = dominio
+    if n_nos is None:
+        n_nos = n_nos_padrao(max(base_teste.n_base, base_tentativa.n_base))
+    A = montar_matriz(QuadraturaGaussLegendre(a, b, n_nos), base_teste, base_tentativa, termos_matriz,
+                      amostras)
+    desvio = None
+    if verificar:
+        A_ref = montar_matriz_quad(dominio, base_teste, base_tentativa, termos_matriz)
+        desvio = _desvio(A, A_ref, n_nos, tol)
+    return A, desvio
+
+
+def montar_carga(dominio, base_teste, termos_carga, n_nos=None, verificar=False, tol=1e-8):
+    a, b = dominio
+    if n_nos is None:
+        n_nos = n_nos_padrao(base_teste.n_base)
+    b_vec = montar_vetor(QuadraturaGaussLegendre(a, b, n_nos), base_teste, termos_carga)
+    desvio = None
+    if verificar:
+        b_ref = montar_vetor_quad(dominio, base_teste, termos_carga)
+        desvio = _desvio(b_vec, b_ref, n_nos, tol)
+    return b_vec, desvio
+
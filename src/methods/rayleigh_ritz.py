@@ -1,25 +1,36 @@
-from .edp_solver_base import EDPSolver
+from .edp_solver_base import EDPSolver, coeficientes_constantes, derivar
+from .bases import BaseSenos, BaseSimbolica, matrizes_senos, matriz_conveccao_senos
 import numpy as np
 import sympy as sp
-from scipy.integrate import quad
-from numpy.linalg import solve
 
 
 class RayleighRitz(EDPSolver):
     # ✅ 1. Inicialização
-    def __init__(self, dominio, n_pontos, condicoes_contorno, funcoes_base=None):
-        self.dominio = dominio
-        self.n_pontos = n_pontos
-        self.condicoes_contorno = condicoes_contorno
-        self.x = np.linspace(dominio[0], dominio[1], n_pontos)
+    def __init__(self, dominio, n_pontos, condicoes_contorno, funcoes_base=None,
+                 n_quad=None, verificar_quad=False, n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno, n_quad, verificar_quad, n_base)
         self.h = (dominio[1] - dominio[0]) / (n_pontos - 1)
-        self.n_base = max(3, n_pontos - 2)
 
-        # Gera funções base senoidais se não forem fornecidas
-        if funcoes_base is None:
-            self.funcoes_base = self._gerar_funcoes_base_trigonometricas()
-        else:
-            self.funcoes_base = funcoes_base
+        # Gera funções base senoidais se não forem fornecidas (sob demanda:
+        # a montagem usa a base numérica e só precisa das expressões em casos especiais)
+        self.base_padrao = funcoes_base is None
+        self._funcoes_base = funcoes_base
+        if funcoes_base is not None:
+            self.n_base = len(funcoes_base)
+
+    @property
+    def funcoes_base(self):
+        if self._funcoes_base is None:
+            self._funcoes_base = self._gerar_funcoes_base_trigonometricas()
+        return self._funcoes_base
+
+    @funcoes_base.setter
+    def funcoes_base(self, funcoes):
+        # A nova base passa a ser usada na montagem (None volta aos senos)
+        self._funcoes_base = funcoes
+        self.base_padrao = funcoes is None
+        if funcoes is not None:
+            self.n_base = len(funcoes)
 
     def _gerar_funcoes_base_trigonometricas(self):
         x = sp.Symbol('x')
@@ -30,62 +41,44 @@ class RayleighRitz(EDPSolver):
             funcoes.append(phi)
         return funcoes
 
-    def resolver(self, edp_params):
-        x = sp.Symbol('x')
-        if not isinstance(edp_params['f'], sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
-        a, b = self.dominio
-
-        # ✅ 2. Montagem da matriz de rigidez K
-        K = np.zeros((self.n_base, self.n_base))
-        F = np.zeros(self.n_base)
-
-        for i in range(self.n_base):
-            for j in range(self.n_base):
-                phi_i = self.funcoes_base[i]
-                phi_j = self.funcoes_base[j]
-
-                dphi_i = sp.diff(phi_i, x)
-                dphi_j = sp.diff(phi_j, x)
+    def _base_tentativa(self):
+        if self.base_padrao:
+            return BaseSenos(self.dominio, self.n_base)
+        return BaseSimbolica(self.funcoes_base)
 
-                integrand_k = (edp_params['p'] * dphi_i * dphi_j +
-                               edp_params['q'] * dphi_i * phi_j +
-                               edp_params['r'] * phi_i * phi_j)
+    def _base_hierarquica(self):
+        return self.base_padrao
 
-                func_k = sp.lambdify(x, integrand_k, 'numpy')
-                try:
-                    K[i, j], _ = quad(func_k, a, b)
-                except:
-                    K[i, j] = 0
+    def _forma_simetrica(self):
+        return True
 
-            # ✅ 3. Montagem do vetor de força F
-            integrand_f = self.funcoes_base[i] * edp_params['f']
-            func_f = sp.lambdify(x, integrand_f, 'numpy')
-            try:
-                F[i], _ = quad(func_f, a, b)
-            except:
-                F[i] = 0
+    def _sinal_difusao(self):
+        # Forma forte -(p u')' + ...
+        return -1
 
-        # ✅ 4. Resolução do sistema K * c = F
-        try:
-            coef = solve(K, F)
-        except:
-            coef = np.zeros(self.n_base)
+    # ✅ 2. Matriz de rigidez K
+    def _termos_matriz(self, edp_params):
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        # ∫ (p φi' φj' + q φi' φj + r φi φj) dx
+        return [(p, 1, 1), (q, 1, 0), (r, 0, 0)]
 
-        # ✅ 5. Construção da solução u_h(x)
-        x_vals = self.x
-        resultado = np.zeros_like(x_vals)
-        for i, c in enumerate(coef):
-            phi_func = sp.lambdify(x, self.funcoes_base[i], 'numpy')
-            try:
-                resultado += c * phi_func(x_vals)
-            except:
-                pass
+    def _termos_residuo(self, edp_params):
+        # Forma forte de K c = F: -(p u')' - (q u)' + r u = f
+        p, q, r = (sp.sympify(edp_params[k]) for k in ('p', 'q', 'r'))
+        return [(-p, 2), (-derivar(p) - q, 1), (r - derivar(q), 0)]
 
-        # ✅ 6. Ajuste das condições de contorno (Dirichlet)
-        # Removido o ajuste manual da solução estacionária para problemas dinâmicos
-        #if self.condicoes_contorno['tipo'] == 'dirichlet':
-        #    u_a, u_b = self.condicoes_contorno['valores']
-        #    resultado += u_a + (u_b - u_a) * (x_vals - a) / (b - a)
+    # ✅ 3. Vetor de força F = ∫ f φi dx (termos de teste padrão do EDPSolver)
+    def _matriz_exata(self, edp_params):
+        constantes = coeficientes_constantes(edp_params)
+        if not self.base_padrao or constantes is None:
+            return None
+        p, q, r = constantes
+        massa, rigidez = matrizes_senos(self.dominio, self.n_base)
+        K = np.diag(p * rigidez + r * massa)
+        if q != 0:
+            K += q * matriz_conveccao_senos(self.n_base)
+        return K
 
-        return resultado, coef
+    # ✅ 4. Resolução de K * c = F e ✅ 5. construção de u_h(x) ficam no EDPSolver.
+    # ✅ 6. Sem ajuste manual das condições de contorno (Dirichlet): a solução
+    # estacionária dos problemas dinâmicos é somada pelos time solvers.
@@ -1,66 +1,68 @@
-from .edp_solver_base import EDPSolver
+from .edp_solver_base import EDPSolver, compilar, derivar
+from .perfil import fase
+from .bases import BaseSimbolica
 import numpy as np
 import sympy as sp
 from scipy.integrate import quad
-from numpy.linalg import solve
+
+N_NOS_SUBDOMINIO = 16
 
 
 class MetodoSubdominios(EDPSolver):
-    def resolver(self, edp_params):
+    def __init__(self, dominio, n_pontos, condicoes_contorno, n_base=None):
+        super().__init__(dominio, n_pontos, condicoes_contorno, n_base=n_base)
         x = sp.Symbol('x')
-        if not isinstance(edp_params['f'], sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(edp_params['f'])}")
-
-        a, b = self.dominio
-
-        n_sub = max(3, self.n_pontos - 2)
-        subdominios = np.linspace(a, b, n_sub + 1)
-        phi_base = []
-
-        for i in range(1, n_sub + 1):
+        a, b = dominio
+        subdominios = np.linspace(a, b, self.n_base + 1)
+        self.phi_base = []
+        for i in range(1, self.n_base + 1):
             phi = sp.Piecewise(
                 (1, (x >= subdominios[i-1]) & (x <= subdominios[i])),
                 (0, True)
             )
-            phi_base.append(phi)
+            self.phi_base.append(phi)
 
-        A = np.zeros((n_sub, n_sub))
-        b_vec = np.zeros(n_sub)
+    def _base_tentativa(self):
+        return BaseSimbolica(self.phi_base)
+
+    def _termos_residuo(self, edp_params):
+        # Base constante por partes: não há derivadas para o resíduo forte
+        return None
 
+    # Funções indicadoras são descontínuas: as integrais seguem com quad adaptativa
+    def montar_operador(self, edp_params):
+        a, b = self.dominio
+        n_sub = self.n_base
+        A = np.zeros((n_sub, n_sub))
         for i in range(n_sub):
             for j in range(n_sub):
-                phi_j = phi_base[j]
-                Lu_j = (edp_params['p'] * sp.diff(phi_j, x, 2) +
-                        edp_params['q'] * sp.diff(phi_j, x) +
-                        edp_params['r'] * phi_j)
-
-                integrand = phi_base[i] * Lu_j
-                func = sp.lambdify(x, integrand, 'numpy')
+                phi_j = self.phi_base[j]
+                with fase('simbolico'):
+                    Lu_j = (edp_params['p'] * derivar(phi_j, 2) +
+                            edp_params['q'] * derivar(phi_j, 1) +
+                            edp_params['r'] * phi_j)
+                    integrand = self.phi_base[i] * Lu_j
+                func = compilar(integrand)
                 try:
                     A[i, j], _ = quad(func, a, b)
                 except:
                     A[i, j] = 0
+        return A
 
-            integrand_rhs = phi_base[i] * edp_params['f']
-            func_rhs = sp.lambdify(x, integrand_rhs, 'numpy')
-            try:
-                b_vec[i], _ = quad(func_rhs, a, b)
-            except:
-                b_vec[i] = 0
-
-        try:
-            coef = solve(A, b_vec)
-        except:
-            coef = np.zeros(n_sub)
-
-        # Calcula a solução aproximada nos pontos do domínio
-        x_vals = np.linspace(a, b, self.n_pontos)
-        resultado = np.zeros_like(x_vals)
-        for i, c in enumerate(coef):
-            phi_func = sp.lambdify(x, phi_base[i], 'numpy')
-            try:
-                resultado += c * phi_func(x_vals)
-            except:
-                pass
+    def funcional_carga(self, edp_params):
+        # Gauss-Legendre composto: um bloco de nós por subdomínio
+        a, b = self.dominio
+        n_sub = self.n_base
+        xi, wi = np.polynomial.legendre.leggauss(N_NOS_SUBDOMINIO)
+        limites = np.linspace(a, b, n_sub + 1)
+        meia = 0.5 * np.diff(limites)[:, None]
+        x_amostras = (meia * xi + 0.5 * (limites[1:] + limites[:-1])[:, None]).ravel()
+        W = np.zeros((n_sub, n_sub * N_NOS_SUBDOMINIO))
+        for i in range(n_sub):
+            W[i, i * N_NOS_SUBDOMINIO:(i + 1) * N_NOS_SUBDOMINIO] = meia[i] * wi
+        return x_amostras, W
 
-        return resultado, coef
+    def montar_carga(self, edp_params):
+        # Mesma quadratura de resolver_f: resolver() e resolver_f() dão a mesma carga
+        x_amostras, W = self.funcional_carga(edp_params)
+        return W @ compilar(edp_params['f'])(x_amostras)
@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import sympy as sp
+from . import METODOS
+from .edp_solver_base import compilar, parametros, parametros_livres
+
+# Varredura de parâmetros: p, q, r e f podem conter parâmetros livres (ex.: k em
+# r = k**2, alfa em p = alfa). As expressões são compiladas uma única vez como
+# funções de (x, parâmetros) e cada ponto da grade só reavalia as amostras nos nós
+# da quadratura, monta, fatora e resolve. Os pontos são divididos em blocos
+# contíguos entre os processos; cada processo cria um único solver.
+#
+# Quando p, q e r não dependem dos parâmetros o operador é único: a grade inteira
+# vira uma família de cargas resolvida em lote (resolver_lote) no processo atual.
+
+
+def grade_parametros(grade):
+    # {nome: valores} -> (nomes, forma da grade, pontos (n_pontos_grade, n_parametros))
+    nomes = tuple(grade)
+    eixos = [np.atleast_1d(np.asarray(grade[nome], dtype=float)) for nome in nomes]
+    malhas = np.meshgrid(*eixos, indexing='ij')
+    forma = tuple(len(eixo) for eixo in eixos)
+    return nomes, forma, np.stack([m.ravel() for m in malhas], axis=-1).reshape(-1, len(nomes))
+
+
+def _resolver_bloco(classe, dominio, n_pontos, condicoes_contorno, edp_params, nomes, pontos, opcoes):
+    solver = classe(dominio, n_pontos, condicoes_contorno, **opcoes)
+    solucoes, coeficientes = [], []
+    for valores in pontos:
+        with parametros(**dict(zip(nomes, valores))):
+            solucao, coef = solver.resolver(edp_params)
+        solucoes.append(solucao)
+        coeficientes.append(coef)
+    return np.array(solucoes, dtype=float), np.array(coeficientes, dtype=float)
+
+
+def _resolver_lote(classe, dominio, n_pontos, condicoes_contorno, edp_params, nomes, pontos, opcoes):
+    solver = classe(dominio, n_pontos, condicoes_contorno, **opcoes)
+    f = compilar(edp_params['f'])
+
+    def cargas(x_vals):
+        F = np.empty((len(pontos), len(x_vals)))
+        for i, valores in enumerate(pontos):
+            with parametros(**dict(zip(nomes, valores))):
+                F[i] = f(x_vals)
+        return F
+    return solver.resolver_lote(edp_params, cargas)
+
+
+def varredura(metodo, dominio, n_pontos, condicoes_contorno, edp_params, grade,
+              n_processos=None, **opcoes):
+    # metodo: nome em METODOS ou a classe do solver; opcoes vão para o construtor.
+    # grade: {nome: valores}; resolve todos os pontos do produto cartesiano.
+    # Devolve (solucoes, coeficientes) empilhados com formas (*forma_grade, n_pontos)
+    # e (*forma_grade, n_base), na ordem dos nomes da grade.
+    classe = METODOS[metodo] if isinstance(metodo, str) else metodo
+    edp_params = {k: sp.sympify(v) for k, v in edp_params.items()}
+    nomes, forma, pontos = grade_parametros(grade)
+    livres = set().union(*(parametros_livres(edp_params[k]) for k in ('p', 'q', 'r', 'f')))
+    faltando = livres - set(nomes)
+    if faltando:
+        raise ValueError(f"Parâmetros livres sem valores na grade: {', '.join(sorted(faltando))}.")
+    argumentos = (classe, dominio, n_pontos, condicoes_contorno, edp_params, nomes)
+
+    operador_fixo = not any(parametros_livres(edp_params[k]) for k in ('p', 'q', 'r'))
+    if operador_fixo:
+        solucoes, coeficientes = _resolver_lote(*argumentos, pontos, opcoes)
+    else:
+        if n_processos is None:
+            n_processos = os.cpu_count() or 1
+        n_processos = max(1, min(int(n_processos), len(pontos)))
+        blocos = np.array_split(pontos, n_processos)
+        if n_processos == 1:
+            resultados = [_resolver_bloco(*argumentos, blocos[0], opcoes)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                futuros = [executor.submit(_resolver_bloco, *argumentos, bloco, opcoes)
+                           for bloco in blocos]
+                resultados = [futuro.result() for futuro in futuros]
+        solucoes = np.concatenate([s for s, _ in resultados])
+        coeficientes = np.concatenate([c for _, c in resultados])
+    return (solucoes.reshape(forma + solucoes.shape[1:]),
+            coeficientes.reshape(forma + coeficientes.shape[1:]))
@@ -1 +1,471 @@
-# Arquivo de testes removido conforme solicitado.
+# Testes de comportamento dos solvers (python -m pytest -q, a partir da raiz ou de src/)
+import warnings
+import numpy as np
+import pytest
+import sympy as sp
+from methods import METODOS, Galerkin, MetodoMinimosQuadrados, RayleighRitz
+from methods.bases import BaseLagrange, BaseSenos
+from methods.edp_solver_base import FatoracaoBordeada, fatorar_matriz, resolver_fatoracao
+from methods.perfil import PerfilExecucao
+
+x = sp.Symbol('x')
+CC = {'tipo': 'dirichlet', 'valores': (0.0, 0.0)}
+# -u'' + u = f com u = sin(πx): Rayleigh-Ritz e elementos finitos usam -(p u')',
+# os demais métodos p u''
+U_EXATA = sp.sin(sp.pi * x)
+
+
+def problema(metodo):
+    p = 1 if metodo in ('Rayleigh-Ritz', 'Elementos Finitos') else -1
+    return {'p': p, 'q': 0, 'r': 1, 'f': sp.expand((sp.pi**2 + 1) * U_EXATA)}
+
+
+def test_quadratura_gauss_legendre_igual_a_quad():
+    from methods.quadratura import (QuadraturaGaussLegendre, montar_matriz, montar_matriz_quad,
+                                    montar_vetor, montar_vetor_quad, n_nos_padrao)
+    base = BaseSenos((0, 2), 6)
+    quad_gl = QuadraturaGaussLegendre(0, 2, n_nos_padrao(base.n_base))
+    termos = [(1 + x, 1, 1), (x, 1, 0), (sp.exp(x), 0, 0)]
+    np.testing.assert_allclose(montar_matriz(quad_gl, base, base, termos),
+                               montar_matriz_quad((0, 2), base, base, termos), atol=1e-10)
+    np.testing.assert_allclose(montar_vetor(quad_gl, base, [(x**2, 0)]),
+                               montar_vetor_quad((0, 2), base, [(x**2, 0)]), atol=1e-10)
+
+
+@pytest.mark.parametrize('classe', [RayleighRitz, Galerkin, MetodoMinimosQuadrados])
+def test_matriz_exata_igual_a_quadratura(classe):
+    # Coeficientes constantes usam as matrizes em forma fechada da base de senos
+    from methods.quadratura import QuadraturaGaussLegendre, montar_matriz, n_nos_padrao
+    solver = classe((0, 1), 12, CC)
+    edp = {'p': 2, 'q': 0.5, 'r': 3, 'f': x}
+    exata = solver._matriz_exata(edp)
+    assert exata is not None
+    quad_gl = QuadraturaGaussLegendre(0, 1, n_nos_padrao(solver.n_base))
+    A = montar_matriz(quad_gl, solver._base_teste(), solver._base_tentativa(), solver._termos_matriz(edp))
+    np.testing.assert_allclose(exata, A, atol=1e-12 * np.abs(A).max())
+
+
+@pytest.mark.parametrize('metodo', ['Rayleigh-Ritz', 'Galerkin', 'Colocação', 'Mínimos Quadrados',
+                                    'Elementos Finitos'])
+def test_solucao_manufaturada(metodo):
+    solucao, _ = METODOS[metodo]((0, 1), 41, CC).resolver(problema(metodo))
+    tol = 1e-3 if metodo == 'Elementos Finitos' else 1e-8
+    np.testing.assert_allclose(solucao, np.sin(np.pi * np.linspace(0, 1, 41)), atol=tol)
+
+
+@pytest.mark.parametrize('grau, ordem_minima', [(1, 1.9), (2, 2.9)])
+def test_elementos_finitos_ordem_de_convergencia(grau, ordem_minima):
+    x_erro = np.linspace(0, 1, 1001)
+    u_exata = np.sin(np.pi * x_erro)
+    erros = []
+    for n_elementos in (8, 16, 32):
+        solver = METODOS['Elementos Finitos']((0, 1), 11, CC, grau=grau, n_elementos=n_elementos)
+        _, coef = solver.resolver(problema('Elementos Finitos'))
+        erros.append(np.max(np.abs(solver.reconstruir(coef, x_erro) - u_exata)))
+    ordens = np.log2(np.array(erros[:-1]) / np.array(erros[1:]))
+    assert np.all(ordens > ordem_minima)
+
+
+def test_base_lagrange_interpola_nos():
+    base = BaseLagrange((0, 1), 4, 2)
+    nos = np.linspace(0, 1, base.n_nos)[1:-1]
+    np.testing.assert_allclose(base(nos, 0), np.eye(base.n_base), atol=1e-12)
+
+
+@pytest.mark.filterwarnings('ignore::scipy.linalg.LinAlgWarning')
+def test_fatorar_matriz_singular_avisa():
+    # Pivô exatamente nulo: aviso e coeficientes nulos
+    with pytest.warns(UserWarning):
+        fatoracao = fatorar_matriz(np.ones((3, 3)))
+    assert not np.any(resolver_fatoracao(fatoracao, np.ones(3)))
+
+
+def test_fatorar_matriz_mal_condicionada_avisa_e_resolve():
+    n = 16
+    hilbert = 1.0 / (np.arange(n)[:, None] + np.arange(n)[None, :] + 1)
+    with pytest.warns(UserWarning, match='numericamente singular'):
+        fatoracao = fatorar_matriz(hilbert)
+    assert fatoracao[0] == 'lu'
+    np.testing.assert_allclose(hilbert @ resolver_fatoracao(fatoracao, np.ones(n)), np.ones(n), atol=1e-4)
+
+
+@pytest.mark.parametrize('n_pontos, tol', [(8, 1e-6), (10, 0.2), (12, 0.2)])
+def test_momentos_monomios_mal_condicionados_resolvem(n_pontos, tol):
+    # p u'' + r u = f com u = x: a base de monômios fica mal condicionada a partir de
+    # n_pontos = 10; a LU perde dígitos, mas não pode virar a solução nula
+    solver = METODOS['Momentos']((0, 1), n_pontos, {'tipo': 'dirichlet', 'valores': (0.0, 1.0)})
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        solucao, _ = solver.resolver({'p': 1 + x, 'q': 0, 'r': 1, 'f': x})
+    np.testing.assert_allclose(solucao, solver.x, atol=tol)
+
+
+@pytest.mark.parametrize('metodo, opcoes', [('Galerkin', {}), ('Rayleigh-Ritz', {}),
+                                            ('Momentos', {'base': 'legendre'}),
+                                            ('Elementos Finitos', {})])
+def test_estudo_convergencia_igual_a_resolucoes_independentes(metodo, opcoes):
+    from methods.adaptativo import estudo_convergencia
+    edp = {'p': 1 + x, 'q': 0, 'r': 2, 'f': sp.sin(sp.pi * x)}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        tabela = estudo_convergencia(metodo, (0, 1), 21, CC, edp, [3, 5, 8], **opcoes)
+        for linha in tabela:
+            solver = METODOS[metodo]((0, 1), 21, CC, n_base=linha['n_base'], **opcoes)
+            solucao, _ = solver.resolver(edp)
+            np.testing.assert_allclose(linha['solucao'], solucao, atol=1e-9)
+
+
+def test_fatoracao_bordeada_igual_a_lu():
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((12, 12)) + 12 * np.eye(12)
+    b_vec = rng.standard_normal(12)
+    fatoracao = FatoracaoBordeada(12)
+    for m in (4, 9, 12):
+        fatoracao.ampliar(A[:m, :m])
+        np.testing.assert_allclose(fatoracao.resolver(b_vec[:m]), np.linalg.solve(A[:m, :m], b_vec[:m]))
+    np.testing.assert_allclose(fatoracao.resolver(b_vec[:4], n=4), np.linalg.solve(A[:4, :4], b_vec[:4]))
+
+
+def test_fatoracao_bordeada_avisa_mal_condicionada():
+    # Matriz de Hilbert: sem dígitos confiáveis a partir de ~13 linhas
+    n = 16
+    hilbert = 1.0 / (np.arange(n)[:, None] + np.arange(n)[None, :] + 1)
+    fatoracao = FatoracaoBordeada(n)
+    fatoracao.ampliar(hilbert[:4, :4])
+    with pytest.warns(UserWarning, match='singular'):
+        fatoracao.ampliar(hilbert)
+    # Só avisa: a solução da LU por blocos continua com resíduo pequeno
+    np.testing.assert_allclose(hilbert @ fatoracao.resolver(np.ones(n)), np.ones(n), atol=1e-4)
+
+
+def test_cache_disco_ida_e_volta(tmp_path):
+    from methods.cache_disco import configurar_cache
+    edp = {'p': 1 + x, 'q': 0, 'r': 2, 'f': x**2}
+    cache = configurar_cache(str(tmp_path))
+    try:
+        for metodo in ('Galerkin', 'Elementos Finitos'):
+            solucao, coef = METODOS[metodo]((0, 1), 21, CC).resolver(edp)
+            acertos = cache.acertos
+            solucao_cache, coef_cache = METODOS[metodo]((0, 1), 21, CC).resolver(edp)
+            assert cache.acertos == acertos + 1
+            np.testing.assert_array_equal(coef_cache, coef)
+            np.testing.assert_array_equal(solucao_cache, solucao)
+    finally:
+        configurar_cache(None)
+
+
+def test_resolver_lote_igual_a_resolucoes_separadas():
+    solver = METODOS['Galerkin']((0, 1), 21, CC)
+    edp = {'p': 1 + x, 'q': 0, 'r': 1, 'f': x}
+    cargas = [sp.sin(k * sp.pi * x) for k in range(1, 4)] + [x**2]
+    solucoes, coef = solver.resolver_lote(edp, cargas)
+    assert solucoes.shape == (4, 21) and coef.shape == (4, solver.n_base)
+    for i, g in enumerate(cargas):
+        np.testing.assert_allclose(solucoes[i], solver.resolver(dict(edp, f=g))[0], atol=1e-13)
+
+
+def test_varredura_igual_a_resolucoes_separadas():
+    from methods.varredura import varredura
+    k = sp.Symbol('k')
+    valores = [0.5, 1.5, 2.5]
+    solucoes, _ = varredura('Galerkin', (0, 1), 21, CC, {'p': 1 + x, 'q': 0, 'r': -k**2, 'f': x},
+                            {'k': valores}, n_processos=1)
+    for i, valor in enumerate(valores):
+        solver = METODOS['Galerkin']((0, 1), 21, CC)
+        solucao, _ = solver.resolver({'p': 1 + x, 'q': 0, 'r': sp.Float(-valor**2), 'f': x})
+        np.testing.assert_allclose(solucoes[i], solucao, atol=1e-12)
+
+
+@pytest.mark.parametrize('metodo', ['Rayleigh-Ritz', 'Galerkin', 'Elementos Finitos'])
+def test_modos_proprios(metodo):
+    # Autovalores de ±u'' (sinal conforme o método) com Dirichlet: ±(kπ)²
+    solver = METODOS[metodo]((0, 1), 101, CC)
+    autovalores, modos, _ = solver.modos_proprios({'p': 1, 'q': 0, 'r': 0}, 3)
+    np.testing.assert_allclose(np.abs(autovalores), (np.pi * np.arange(1, 4))**2, rtol=1e-3)
+    np.testing.assert_allclose(modos[0] / modos[0].max(), np.sin(np.pi * solver.x), atol=1e-3)
+
+
+@pytest.mark.parametrize('metodo', ['Rayleigh-Ritz', 'Galerkin', 'Colocação', 'Elementos Finitos'])
+def test_onda_implicita_acompanha_integrador_modal(metodo):
+    from time_solvers.onda_1d import solve_onda_1d
+    _, exata = solve_onda_1d('0', 'sin(pi*x)', '0', 0, 1, 0, 0, 21, 0.005, 100, esquema='exato')
+    _, implicita = solve_onda_1d('0', 'sin(pi*x)', '0', 0, 1, 0, 0, 21, 0.005, 100, metodo=metodo)
+    assert implicita.shape == exata.shape
+    # O passo implícito amortece, mas a onda precisa se mover (não fica parada no 1º passo)
+    assert np.max(np.abs(implicita - exata)) < 0.05
+    assert implicita[-1].max() < 0.1
+
+
+@pytest.mark.parametrize('metodo', ['Rayleigh-Ritz', 'Galerkin', 'Colocação', 'Elementos Finitos'])
+def test_calor_mesma_convencao_de_contorno_nos_dois_modos(metodo):
+    from time_solvers.calor_1d import solve_calor_1d
+    argumentos = ('0', 'sin(pi*x) + x', 0, 1, 0, 1, 21, 0.01, 10)
+    _, exato = solve_calor_1d(*argumentos, modo='exato')
+    _, implicito = solve_calor_1d(*argumentos, metodo=metodo)
+    np.testing.assert_allclose(implicito[:, [0, -1]], exato[:, [0, -1]], atol=1e-12)
+    np.testing.assert_allclose(implicito[-1], exato[-1], atol=0.03)
+
+
+def test_cli_rejeita_nome_fora_da_saida():
+    from cli import normalizar
+    with pytest.raises(ValueError):
+        normalizar({'nome': '../fora'}, 0)
+    assert normalizar({'nome': 'caso-1'}, 0)['nome'] == 'caso-1'
+
+
+@pytest.mark.parametrize('metodo', list(METODOS))
+def test_resolver_f_igual_a_resolver(metodo):
+    # Momentos com a base de Legendre: a de monômios amplifica o arredondamento da carga
+    opcoes = {'base': 'legendre'} if metodo == 'Momentos' else {}
+    edp = {'p': 1 + x, 'q': 0, 'r': 2, 'f': x}
+    g = sp.sin(sp.pi * x) + x**2
+    solver = METODOS[metodo]((0, 1), 15, CC, **opcoes)
+    solver.resolver(edp)
+    solucao, coef = solver.resolver_f(g)
+    solucao_ref, coef_ref = METODOS[metodo]((0, 1), 15, CC, **opcoes).resolver(dict(edp, f=g))
+    np.testing.assert_allclose(coef, coef_ref, rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(solucao, solucao_ref, atol=1e-13)
+
+
+def test_resolver_nova_carga_reaproveita_fatoracao(monkeypatch):
+    import methods.edp_solver_base as edp_solver_base
+    from execucao import resolver_nova_carga, resolver_todos
+    parametros = {'a': 0, 'b': 1, 'ua': 0, 'ub': 0, 'n_pontos': 21, 'p': '1 + x', 'q': '0', 'r': '2',
+                  'f': 'x'}
+    metodos = ['Galerkin', 'Colocação', 'Elementos Finitos']
+    resultados = resolver_todos('Poisson', parametros, metodos, n_processos=1, manter_solver=True)
+    solvers = {metodo: resultados[metodo]['solver'] for metodo in metodos}
+    fatoracoes = {metodo: solver._fatoracao for metodo, solver in solvers.items()}
+
+    def nao_refatorar(A):
+        raise AssertionError("fatorar_matriz chamada quando só f mudou")
+    monkeypatch.setattr(edp_solver_base, 'fatorar_matriz', nao_refatorar)
+    novos = resolver_nova_carga(solvers, 'sin(pi*x)')
+    monkeypatch.undo()
+    for metodo, solver in solvers.items():
+        assert novos[metodo]['erro'] is None
+        assert solver._fatoracao is fatoracoes[metodo]
+        referencia, _ = METODOS[metodo]((0, 1), 21, CC).resolver(
+            {'p': 1 + x, 'q': 0, 'r': 2, 'f': sp.sin(sp.pi * x)})
+        np.testing.assert_allclose(novos[metodo]['solution'], referencia, atol=1e-13)
+
+
+class GalerkinSingularGrande(METODOS['Galerkin']):
+    # A partir de 16 funções base devolve coeficientes nulos, como um sistema singular
+    def resolver(self, edp_params):
+        solucao, coef = super().resolver(edp_params)
+        if self.n_base >= 16:
+            return np.zeros_like(solucao), np.zeros_like(coef)
+        return solucao, coef
+
+
+@pytest.mark.parametrize('metodo, edp, opcoes, motivo', [
+    ('Galerkin', {'p': 1, 'q': 0, 'r': 0, 'f': sp.sin(sp.pi * x)}, {'tol': 1e-8}, 'convergiu'),
+    ('Galerkin', {'p': 1 + x, 'q': 0, 'r': 2, 'f': x}, {'tol': 1e-14, 'n_maximo': 16}, 'n_maximo'),
+    ('Momentos', {'p': 1 + x, 'q': 0, 'r': 2, 'f': x}, {'tol': 1e-14}, 'estagnou'),
+    (GalerkinSingularGrande, {'p': 1 + x, 'q': 0, 'r': 2, 'f': x}, {'tol': 1e-14}, 'singular'),
+    ('Galerkin', {'p': 1 + x, 'q': 0, 'r': 2, 'f': x}, {'tol': 1e-14, 'tempo_maximo': 0.0}, 'tempo'),
+])
+def test_adaptativo_motivo_de_parada(metodo, edp, opcoes, motivo):
+    from methods.adaptativo import resolver_adaptativo
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        _, _, relatorio = resolver_adaptativo(metodo, (0, 1), 21, CC, edp, **opcoes)
+    assert relatorio['motivo'] == motivo
+    assert relatorio['convergiu'] == (motivo == 'convergiu')
+    if motivo == 'singular':
+        # O nível de 8 funções é finito, mas os últimos são singulares
+        assert np.isfinite(relatorio['historico'][1]['estimativa'])
+        assert relatorio['estimativa'] == np.inf
+
+
+def test_senos_para_nos_ida_e_volta():
+    from methods.bases import nos_para_senos, senos_para_nos
+    coef = np.random.default_rng(1).standard_normal((3, 10))
+    valores = senos_para_nos(coef, 12)
+    assert valores.shape == (3, 12) and not np.any(valores[:, [0, -1]])
+    np.testing.assert_allclose(nos_para_senos(valores), coef, atol=1e-13)
+    np.testing.assert_allclose(senos_para_nos(nos_para_senos(valores[0]), 12), valores[0], atol=1e-13)
+
+
+@pytest.mark.parametrize('n_pontos', [12, 25, 8])
+def test_base_senos_dst_igual_a_avaliacao_direta(n_pontos):
+    # n_pontos >= n_base + 2 usa a DST-I; abaixo disso, o produto direto
+    base = BaseSenos((0, 2), 10)
+    coef = np.random.default_rng(2).standard_normal((2, 10))
+    x_vals = np.linspace(0, 2, n_pontos)
+    np.testing.assert_allclose(base.combinar(coef, x_vals), coef @ base(x_vals), atol=1e-13)
+    np.testing.assert_allclose(base.combinar(coef[0], x_vals), coef[0] @ base(x_vals), atol=1e-13)
+
+
+def test_colocacao_projetar_pela_dst_igual_a_lu():
+    solver = METODOS['Colocação']((0, 1), 21, CC)
+    edp = solver.operador_difusao(1, 10)
+    x_amostras, W = solver.funcional_carga(edp)
+    B = solver.matriz_carga(edp)
+    cargas = W @ np.column_stack([np.exp(x_amostras), x_amostras**2])
+    np.testing.assert_allclose(solver.projetar(cargas, B), resolver_fatoracao(fatorar_matriz(B), cargas),
+                               atol=1e-12)
+
+
+@pytest.mark.parametrize('p', [1, 1 + x])
+def test_trocar_funcoes_base_nao_reaproveita_operador(p):
+    # Mesmos p, q, r e mesmo nº de funções: só a base muda
+    edp = {'p': p, 'q': 0, 'r': 1, 'f': x}
+    funcoes = [x * (1 - x), x**2 * (1 - x), x**3 * (1 - x)]
+    solver = METODOS['Rayleigh-Ritz']((0, 1), 11, CC, n_base=3)
+    solver.resolver(edp)
+    solver.funcoes_base = funcoes
+    solucao, coef = solver.resolver(edp)
+    solucao_ref, coef_ref = METODOS['Rayleigh-Ritz']((0, 1), 11, CC, funcoes_base=funcoes).resolver(edp)
+    np.testing.assert_allclose(coef, coef_ref, atol=1e-12)
+    np.testing.assert_allclose(solucao, solucao_ref, atol=1e-12)
+
+
+@pytest.mark.filterwarnings('ignore:Matriz do sistema')
+@pytest.mark.parametrize('metodo', ['Galerkin', 'Subdomínios', 'Elementos Finitos'])
+def test_perfil_registra_fases_e_soma_o_tempo_total(metodo):
+    import time
+    from methods.perfil import FASES, registrar_coletor, remover_coletor
+    recebidos = []
+    coletor = registrar_coletor(recebidos.append)
+    try:
+        solver = METODOS[metodo]((0, 1), 21, CC)
+        inicio = time.perf_counter()
+        _, _, perfil = solver.resolver_com_perfil({'p': 1 + x, 'q': 0, 'r': 2, 'f': sp.exp(x)})
+        decorrido = time.perf_counter() - inicio
+    finally:
+        remover_coletor(coletor)
+    assert recebidos == [perfil]
+    assert set(perfil.fases) == set(FASES)
+    for nome in ('montagem', 'solucao', 'avaliacao'):
+        assert perfil.chamadas[nome] > 0
+    # Tempos exclusivos: fases + outros = total, que não passa do tempo de relógio
+    assert all(duracao >= 0 for duracao in perfil.fases.values())
+    assert sum(perfil.fases.values()) + perfil.outros == pytest.approx(perfil.total)
+    assert 0.5 * decorrido <= perfil.total <= decorrido
+    resumo = PerfilExecucao.de_resumo(perfil.resumo())
+    assert resumo.fases == perfil.fases and resumo.total == perfil.total
+
+
+def test_colocacao_chebyshev_precisao_espectral():
+    # -u'' + u = f com u = sin(πx): o erro cai exponencialmente com o nº de nós
+    edp = {'p': -1, 'q': 0, 'r': 1, 'f': sp.expand((sp.pi**2 + 1) * U_EXATA)}
+    x_saida = np.linspace(0, 1, 101)
+    erros = []
+    for n_cheb in (4, 8, 12, 16):
+        solver = METODOS['Colocação']((0, 1), 101, CC, modo='chebyshev', n_cheb=n_cheb)
+        solucao, _ = solver.resolver(edp)
+        erros.append(np.max(np.abs(solucao - np.sin(np.pi * x_saida))))
+    assert erros[-1] < 1e-13
+    # Cada 4 nós a mais ganham pelo menos 4 ordens de grandeza até o arredondamento
+    assert erros[1] < 1e-4 * erros[0] and erros[2] < 1e-4 * erros[1]
+
+
+@pytest.mark.parametrize('ordem', [1, 2])
+def test_chebyshev_derivada_pela_dct_igual_a_direta(ordem):
+    from methods.bases import BaseChebyshevLobatto
+    base = BaseChebyshevLobatto((0, 2), 16)
+    valores = np.sin(np.pi * base.nos[1:-1])
+    # Série pela DCT derivada e avaliada nos nós = matriz de diferenciação nos valores
+    np.testing.assert_allclose(base.combinar(valores, base.nos, ordem),
+                               base.diferenciacao(ordem) @ base.completar(valores), atol=1e-11)
+    # e ambas aproximam a derivada exata fora dos nós
+    x_vals = np.linspace(0, 2, 101)
+    exata = np.pi * np.cos(np.pi * x_vals) if ordem == 1 else -np.pi**2 * np.sin(np.pi * x_vals)
+    np.testing.assert_allclose(base.combinar(valores, x_vals, ordem), exata, atol=1e-6)
+
+
+class DerrubaProcesso:
+    # Ao ser desserializado no processo do método, encerra o processo sem resultado
+    def __reduce__(self):
+        import os
+        return (os._exit, (3,))
+
+
+def _resolver_todos_com_prazo(*args, prazo=60, **kwargs):
+    # Falha (em vez de travar a suíte) se o orquestrador não voltar no prazo
+    from concurrent.futures import ThreadPoolExecutor
+    from execucao import resolver_todos
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(resolver_todos, *args, **kwargs).result(timeout=prazo)
+
+
+PARAMETROS_POISSON = {'a': 0, 'b': 1, 'ua': 0, 'ub': 1, 'n_pontos': 21, 'p': '1 + x', 'q': '0',
+                      'r': '2', 'f': 'x'}
+
+
+def test_resolver_todos_em_processos():
+    from execucao import somar_uso_cache
+    metodos = ['Galerkin', 'Elementos Finitos']
+    progresso = []
+    resultados = _resolver_todos_com_prazo('Poisson', PARAMETROS_POISSON, metodos, n_processos=2,
+                                           progresso=lambda *args: progresso.append(args))
+    assert list(resultados) == metodos
+    for metodo in metodos:
+        assert resultados[metodo]['erro'] is None
+        referencia, _ = METODOS[metodo]((0, 1), 21, {'tipo': 'dirichlet', 'valores': (0.0, 1.0)}).resolver(
+            {'p': 1 + x, 'q': 0, 'r': 2, 'f': x})
+        np.testing.assert_allclose(resultados[metodo]['solution'], referencia, atol=1e-12)
+    assert sorted(m for m, _, _ in progresso) == sorted(metodos)
+    # Os contadores do cache vêm de cada processo e são somados pelo orquestrador
+    total = somar_uso_cache(resultados)
+    for nome, uso in total.items():
+        assert uso['falhas'] == sum(resultados[m]['cache'][nome]['falhas'] for m in metodos)
+    assert total['compilacao']['falhas'] > 0
+
+
+def test_resolver_todos_falha_do_processo_vira_erro():
+    metodos = ['Galerkin', 'Elementos Finitos']
+    # Processo que morre sem devolver resultado
+    resultados = _resolver_todos_com_prazo('Poisson', dict(PARAMETROS_POISSON, derrubar=DerrubaProcesso()),
+                                           metodos, n_processos=2)
+    for metodo in metodos:
+        assert resultados[metodo]['solution'] is None
+        assert 'sem resultado' in resultados[metodo]['erro']
+    # Exceção dentro do método: a mensagem volta em 'erro' e o outro método segue
+    resultados = _resolver_todos_com_prazo('Poisson', dict(PARAMETROS_POISSON, f='x +'), metodos,
+                                           n_processos=2)
+    for metodo in metodos:
+        assert resultados[metodo]['erro'].startswith('SympifyError')
+
+
+def test_resolver_todos_cancelar_encerra_os_processos():
+    import threading
+    import time
+    cancelar = threading.Event()
+    # Subdomínios com 400 funções base leva minutos: só o cancelamento o encerra
+    parametros = dict(PARAMETROS_POISSON, n_pontos=402)
+    threading.Timer(1.0, cancelar.set).start()
+    inicio = time.perf_counter()
+    resultados = _resolver_todos_com_prazo('Poisson', parametros, ['Subdomínios', 'Galerkin'],
+                                           n_processos=1, cancelar=cancelar)
+    assert time.perf_counter() - inicio < 20
+    assert resultados['Subdomínios']['cancelado']
+    assert all(resultado['cancelado'] for resultado in resultados.values())
+
+
+def test_compilar_reaproveita_o_cache():
+    from methods.edp_solver_base import compilar, estatisticas_cache
+
+    def contadores():
+        return {nome: (info['acertos'], info['falhas']) for nome, info in estatisticas_cache().items()}
+
+    expr = x**7 + sp.Rational(13, 17) * sp.cosh(3 * x)
+    antes = contadores()
+    funcao = compilar(expr)
+    depois = contadores()
+    assert depois['compilacao'] == (antes['compilacao'][0], antes['compilacao'][1] + 1)
+    assert depois['derivacao'] == antes['derivacao']
+    # A mesma expressão (inclusive como texto) volta do cache, sem compilar de novo
+    assert compilar(expr) is funcao and compilar(str(expr)) is funcao
+    assert contadores()['compilacao'] == (depois['compilacao'][0] + 2, depois['compilacao'][1])
+    # Derivada: uma falha de derivação e uma de compilação; a repetição só acerta
+    antes = contadores()
+    derivada = compilar(expr, 1)
+    assert contadores() == {'derivacao': (antes['derivacao'][0], antes['derivacao'][1] + 1),
+                            'compilacao': (antes['compilacao'][0], antes['compilacao'][1] + 1)}
+    assert compilar(expr, 1) is derivada
+    assert contadores() == {'derivacao': (antes['derivacao'][0] + 1, antes['derivacao'][1] + 1),
+                            'compilacao': (antes['compilacao'][0] + 1, antes['compilacao'][1] + 1)}
+    np.testing.assert_allclose(derivada(np.array([0.5])), 7 * 0.5**6 + 39 / 17 * np.sinh(1.5))
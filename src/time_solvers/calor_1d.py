@@ -1,52 +1,77 @@
 import numpy as np
 import sympy as sp
-from sympy import interpolate
-from methods.rayleigh_ritz import RayleighRitz
-from methods.galerkin import Galerkin
-from methods.colocacao import MetodoColocacao
-from methods.momentos import MetodoMomentos
-from methods.subdominios import MetodoSubdominios
-from methods.minimos_quadrados import MetodoMinimosQuadrados
+from methods.edp_solver_base import compilar
+from methods.bases import BaseSenos, matrizes_senos, projetar_senos
+from methods.perfil import fase, passo
+from methods import METODOS
 
 # Solver para a equação do Calor 1D usando Euler implícito
 
-def solve_calor_1d(f_expr, u0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo='Rayleigh-Ritz'):
-    x = sp.Symbol('x')
-    p = 1
-    q = 0
-    r = 0
+def solve_calor_1d(f_expr, u0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo='Rayleigh-Ritz', modo='implicito', progresso=None):
+    # modo='exato' usa o propagador exponencial da base de senos nos mesmos instantes
+    # progresso(passo, n_passos) é chamado a cada passo; pode lançar exceção para interromper
+    if modo == 'exato':
+        return solve_calor_1d_exato(f_expr, u0_expr, a, b, ua, ub, n_pontos, dt * np.arange(n_passos + 1))
     f = sp.sympify(f_expr)
-    f_func = sp.lambdify(x, f, 'numpy')
-    u0 = sp.lambdify(x, sp.sympify(u0_expr), 'numpy')
+    f_func = compilar(f)
+    u0 = compilar(u0_expr)
     x_vals = np.linspace(a, b, n_pontos)
-    u = u0(x_vals)
     condicoes_contorno = {'tipo': 'dirichlet', 'valores': (ua, ub)}
-    methods = {
-        'Rayleigh-Ritz': RayleighRitz,
-        'Galerkin': Galerkin,
-        'Colocação': MetodoColocacao,
-        'Momentos': MetodoMomentos,
-        'Subdomínios': MetodoSubdominios,
-        'Mínimos Quadrados': MetodoMinimosQuadrados
-    }
-    solver_cls = methods[metodo]
-    resultados = [u.copy()]
+    solver_cls = METODOS[metodo]
+    # Mesma convenção do modo exato: u0 é o campo total, u = w + reta entre ua e ub
+    # e w (nulo no contorno) satisfaz w_t = w_xx + f, pois a reta tem u_xx = 0
+    reta = _reta(a, b, ua, ub)
+    # Monta EDO para o próximo passo de tempo: (w^{n+1} - w^n)/dt = w_xx + f
+    # => -w_xx + (1/dt)w^{n+1} = (1/dt)w^n + f
+    # O operador não muda entre os passos: monta e fatora uma única vez
+    solver = solver_cls((a, b), n_pontos, condicoes_contorno)
+    operador = solver.operador_difusao(1, 1/dt)
+    solver.fatorar(operador)
+    # Avanço no espaço dos coeficientes: a carga de w^n = Σ c_j φj é B @ c
+    # e a de f é W @ f(x_amostras), ambas calculadas antes do laço.
+    x_amostras, W = solver.funcional_carga(operador)
+    B = solver.matriz_carga(operador)
+    carga_f = W @ f_func(x_amostras)
+    # Coeficientes iniciais: projeção de w0 = u0 - reta com as funções teste do próprio método
+    coef = solver.projetar(W @ (u0(x_amostras) - reta(x_amostras)), B)
+    coeficientes = []
     for t in range(n_passos):
-        # Seleciona no máximo 6 pontos para interpolação simbólica
-        n_interp = min(6, len(x_vals))
-        idxs = np.linspace(0, len(x_vals)-1, n_interp, dtype=int)
-        pontos = list(zip(x_vals[idxs], u[idxs]))
-        u_interp = sp.interpolate(pontos, x)
-        # Monta EDO para o próximo passo de tempo: (u^{n+1} - u^n)/dt = u_xx + f
-        # => -u_xx + (1/dt)u^{n+1} = (1/dt)u^n + f
-        edp_params = {
-            'p': 1,
-            'q': 0,
-            'r': 1/dt,
-            'f': (u_interp/dt) + f
-        }
-        solver = solver_cls((a, b), n_pontos, condicoes_contorno)
-        u_new, _ = solver.resolver(edp_params)
-        u = u_new
-        resultados.append(u.copy())
+        with passo(), fase('solucao'):
+            coef = solver.resolver_fatorado(B @ coef / dt + carga_f)
+        coeficientes.append(coef)
+        if progresso is not None:
+            progresso(t + 1, n_passos)
+    resultados = [u0(x_vals)]
+    if coeficientes:
+        resultados.extend(solver.reconstruir(np.array(coeficientes)) + reta(x_vals))
     return x_vals, np.array(resultados)
+
+
+def _reta(a, b, ua, ub):
+    return lambda x_vals: ua + (ub - ua) * (np.asarray(x_vals) - a) / (b - a)
+
+
+# Propagador exato no tempo para coeficientes constantes na base de senos:
+#   u = w + reta entre ua e ub,  w_t = k w_xx + f
+#   w_k(t) = f_k/λ_k + (w_k(0) - f_k/λ_k) exp(-λ_k t),  λ_k = k (kπ/(b - a))²
+# Cada instante pedido custa O(n_base), sem percorrer os passos intermediários.
+def solve_calor_1d_exato(f_expr, u0_expr, a, b, ua, ub, n_pontos, tempos, difusividade=1.0):
+    tempos = np.atleast_1d(np.asarray(tempos, dtype=float))
+    n_base = max(3, n_pontos - 2)
+    x = sp.Symbol('x')
+    x_vals = np.linspace(a, b, n_pontos)
+    # u0 é o campo total (mesma convenção do passo implícito)
+    sol_estacionaria_expr = ua + (ub - ua) * (x - a) / (b - a)
+    with fase('montagem'):
+        massa, rigidez = matrizes_senos((a, b), n_base)
+        lamb = difusividade * rigidez / massa
+        f_k = projetar_senos(f_expr, (a, b), n_base)
+        w0 = projetar_senos(sp.sympify(u0_expr) - sol_estacionaria_expr, (a, b), n_base)
+    with fase('solucao'):
+        estatico = f_k / lamb
+        coeficientes = estatico + (w0 - estatico) * np.exp(-lamb * tempos[:, None])
+    with fase('avaliacao'):
+        resultados = BaseSenos((a, b), n_base).combinar(coeficientes, x_vals) + compilar(sol_estacionaria_expr)(x_vals)
+    # Em t = 0 devolve a condição inicial exata, como no passo implícito
+    resultados[tempos == 0] = compilar(u0_expr)(x_vals)
+    return x_vals, resultados
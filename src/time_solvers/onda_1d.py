@@ -1,56 +1,116 @@
 import numpy as np
 import sympy as sp
-from methods.rayleigh_ritz import RayleighRitz
-from methods.galerkin import Galerkin
-from methods.colocacao import MetodoColocacao
-from methods.momentos import MetodoMomentos
-from methods.subdominios import MetodoSubdominios
-from methods.minimos_quadrados import MetodoMinimosQuadrados
+from methods.edp_solver_base import compilar
+from methods.bases import BaseSenos, matrizes_senos, projetar_senos
+from methods.perfil import fase, passo
+from methods import METODOS
 
-def solve_onda_1d(f_expr, u0_expr, v0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo='Rayleigh-Ritz', lamb=1.0):
-    x = sp.Symbol('x')
-    p = 1
-    q = 0
-    r = 0
+def solve_onda_1d(f_expr, u0_expr, v0_expr, a, b, ua, ub, n_pontos, dt, n_passos, metodo='Rayleigh-Ritz', lamb=1.0, esquema=None, progresso=None):
+    # esquema='exato', 'leapfrog' ou 'newmark' usa o integrador modal da base de senos
+    # progresso(passo, n_passos) é chamado a cada passo; pode lançar exceção para interromper
+    if esquema is not None:
+        return solve_onda_1d_modal(f_expr, u0_expr, v0_expr, a, b, ua, ub, n_pontos, dt, n_passos, lamb, esquema, progresso)
     f = sp.sympify(f_expr)
-    u0 = sp.lambdify(x, sp.sympify(u0_expr), 'numpy')
-    v0 = sp.lambdify(x, sp.sympify(v0_expr), 'numpy')
+    # O termo fonte deve ser simbólico:
+    if not isinstance(f, sp.Basic):
+        raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(f)}")
+    u0 = compilar(u0_expr)
+    v0 = compilar(v0_expr)
     x_vals = np.linspace(a, b, n_pontos)
     condicoes_contorno = {'tipo': 'dirichlet', 'valores': (ua, ub)}
-    methods = {
-        'Rayleigh-Ritz': RayleighRitz,
-        'Galerkin': Galerkin,
-        'Colocação': MetodoColocacao,
-        'Momentos': MetodoMomentos,
-        'Subdomínios': MetodoSubdominios,
-        'Mínimos Quadrados': MetodoMinimosQuadrados
-    }
-    solver_cls = methods[metodo]
-    # Inicialização
-    u_nm1 = u0(x_vals)  # u^{n-1}
-    u_n = u_nm1 + dt * v0(x_vals)  # u^n (1º passo via Taylor)
+    solver_cls = METODOS[metodo]
     # Solução estacionária (reta entre as condições de contorno)
     sol_estacionaria = ua + (ub - ua) * (x_vals - a) / (b - a)
-    resultados = [u_nm1.copy() + sol_estacionaria, u_n.copy() + sol_estacionaria]
+    # (u^{n+1} - 2u^n + u^{n-1})/dt^2 = lambda^2 u_xx^{n+1} + f
+    # => -lambda^2 u_xx + (1/dt^2)u^{n+1} = (2u^n - u^{n-1})/dt^2 + f
+    # O operador não muda entre os passos: monta e fatora uma única vez
+    solver = solver_cls((a, b), n_pontos, condicoes_contorno)
+    operador = solver.operador_difusao(lamb**2, 1 / dt**2)
+    solver.fatorar(operador)
+    # Avanço no espaço dos coeficientes, como em calor_1d: a carga de u^n = Σ c_j φj
+    # é B @ c e a de f é W @ f(x_amostras), ambas calculadas antes do laço.
+    x_amostras, W = solver.funcional_carga(operador)
+    B = solver.matriz_carga(operador)
+    carga_f = W @ compilar(f)(x_amostras)
+    # Coeficientes iniciais: projeção de u0 e v0 com as funções teste do método;
+    # u^1 pelo 1º passo de Taylor
+    c_nm1, c_v = solver.projetar(np.column_stack([W @ u0(x_amostras), W @ v0(x_amostras)]), B).T
+    c_n = c_nm1 + dt * c_v
+    coeficientes = [c_n]
     for t in range(1, n_passos):
-        # (u^{n+1} - 2u^n + u^{n-1})/dt^2 = lambda^2 u_xx + f
-        # => -lambda^2 u_xx + (1/dt^2)u^{n+1} = (2u^n - u^{n-1})/dt^2 + f
-        # O termo fonte deve ser simbólico:
-        if not isinstance(f, sp.Basic):
-            raise TypeError(f"O parâmetro 'f' deve ser expressão simbólica do SymPy, recebido: {type(f)}")
-        edp_params = {
-            'p': -lamb**2,
-            'q': 0,
-            'r': 1/dt**2,
-            'f': f
-        }
-        solver = solver_cls((a, b), n_pontos, condicoes_contorno)
-        try:
-            u_np1, _ = solver.resolver(edp_params)
-        except TypeError as err:
-            raise TypeError(f"Erro ao resolver EDP: {err}\nVerifique se a função fonte 'f' é simbólica.")
-        # Soma a solução estacionária ao resultado dinâmico
-        u_np1 = u_np1 + sol_estacionaria
-        u_nm1, u_n = u_n, u_np1
-        resultados.append(u_np1.copy())
-    return x_vals, np.array(resultados)
+        with passo(), fase('solucao'):
+            c_np1 = solver.resolver_fatorado(B @ (2 * c_n - c_nm1) / dt**2 + carga_f)
+        c_nm1, c_n = c_n, c_np1
+        coeficientes.append(c_np1)
+        if progresso is not None:
+            progresso(t + 1, n_passos)
+    # Soma a solução estacionária ao resultado dinâmico
+    resultados = [u0(x_vals)[None]]
+    if n_passos >= 1:
+        resultados.append(solver.reconstruir(np.array(coeficientes)))
+    return x_vals, np.concatenate(resultados) + sol_estacionaria
+
+
+# Integrador modal para a base de senos: com p, q, r constantes as matrizes de
+# massa e rigidez são diagonais, e cada modo é um oscilador independente
+#   w_k'' + ω_k² w_k = f_k,  ω_k = lamb * k*pi/(b - a)
+# Cada passo custa O(n_base) operações vetoriais.
+ESQUEMAS_MODAIS = ('exato', 'leapfrog', 'newmark')
+
+
+def solve_onda_1d_modal(f_expr, u0_expr, v0_expr, a, b, ua, ub, n_pontos, dt, n_passos, lamb=1.0, esquema='exato', progresso=None):
+    if esquema not in ESQUEMAS_MODAIS:
+        raise ValueError(f"Esquema desconhecido: {esquema}. Use um de {ESQUEMAS_MODAIS}.")
+    n_base = max(3, n_pontos - 2)
+    base = BaseSenos((a, b), n_base)
+    massa, rigidez = matrizes_senos((a, b), n_base)
+    omega2 = lamb**2 * rigidez / massa
+    omega = np.sqrt(omega2)
+    x_vals = np.linspace(a, b, n_pontos)
+    # Projeção L2 de f, u0 e v0 nos modos
+    with fase('montagem'):
+        f_k = projetar_senos(f_expr, (a, b), n_base)
+        w0 = projetar_senos(u0_expr, (a, b), n_base)
+        v0 = projetar_senos(v0_expr, (a, b), n_base)
+    estatico = f_k / omega2
+
+    if esquema == 'exato':
+        with fase('solucao'):
+            t = dt * np.arange(n_passos + 1)[:, None]
+            coeficientes = estatico + (w0 - estatico) * np.cos(omega * t) + v0 / omega * np.sin(omega * t)
+    else:
+        coeficientes = np.empty((n_passos + 1, n_base))
+        coeficientes[0] = w0
+        if esquema == 'leapfrog':
+            # Diferenças centrais (estável para dt * ω_max < 2)
+            w_nm1 = w0
+            w_n = w0 + dt * v0 + 0.5 * dt**2 * (f_k - omega2 * w0)
+            if n_passos >= 1:
+                coeficientes[1] = w_n
+            for n in range(2, n_passos + 1):
+                with passo(), fase('solucao'):
+                    w_nm1, w_n = w_n, 2 * w_n - w_nm1 + dt**2 * (f_k - omega2 * w_n)
+                coeficientes[n] = w_n
+                if progresso is not None:
+                    progresso(n, n_passos)
+        else:
+            # Newmark de aceleração média (beta = 1/4, gamma = 1/2): incondicionalmente estável
+            w_n, v_n = w0, v0
+            acel = f_k - omega2 * w_n
+            denominador = 1 + 0.25 * dt**2 * omega2
+            for n in range(1, n_passos + 1):
+                with passo(), fase('solucao'):
+                    w_np1 = (w_n + dt * v_n + 0.25 * dt**2 * (acel + f_k)) / denominador
+                    acel_np1 = f_k - omega2 * w_np1
+                    v_n = v_n + 0.5 * dt * (acel + acel_np1)
+                w_n, acel = w_np1, acel_np1
+                coeficientes[n] = w_n
+                if progresso is not None:
+                    progresso(n, n_passos)
+
+    # Solução estacionária (reta entre as condições de contorno)
+    sol_estacionaria = ua + (ub - ua) * (x_vals - a) / (b - a)
+    with fase('avaliacao'):
+        resultados = base.combinar(coeficientes, x_vals) + sol_estacionaria
+    resultados[0] = compilar(u0_expr)(x_vals) + sol_estacionaria
+    return x_vals, resultados